@@ -8,6 +8,7 @@ import re
 import subprocess
 from pathlib import Path
 from typing import Any
+from urllib.parse import quote
 
 
 def find_latest_results(log_func: Any, results_glob: str) -> dict[str, Any] | None:
@@ -121,7 +122,7 @@ def build_commit_url(repo_name: str, commit_sha: str) -> str:
 
 def build_file_line_url(repo_name: str, commit_sha: str, file_path: str, line: int) -> str:
     """Build GitHub URL to a specific file+line at a given commit."""
-    return f"https://github.com/{repo_name}/blob/{commit_sha}/{file_path}#L{line}"
+    return f"https://github.com/{repo_name}/blob/{commit_sha}/{quote(file_path, safe='/')}#L{line}"
 
 
 def build_repo_url(repo_name: str) -> str:
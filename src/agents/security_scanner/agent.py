@@ -1,6 +1,8 @@
 """
 Security Scanner Agent - Scans GitHub repositories for exposed secrets using gitleaks.
 """
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from typing import Any
 
@@ -8,9 +10,21 @@ from src.agents.base_agent import BaseAgent
 from src.agents.security_scanner import scanner as _scanner
 from src.agents.security_scanner.telegram_summary import (
     build_and_send_report,
+    commits_to_resolve,
     send_error_notification,
 )
 
+# Clones spend most of their time waiting on the network, so oversubscribe the CPUs the way
+# ThreadPoolExecutor does for I/O-bound work rather than capping at one scan per core.
+_DEFAULT_SCAN_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+
+def _resolved(result: dict[str, Any]) -> Future:
+    """Wrap an already-computed scan result so run() handles it like a pooled scan."""
+    future: Future = Future()
+    future.set_result(result)
+    return future
+
 
 class SecurityScannerAgent(BaseAgent):
     """
@@ -26,11 +40,43 @@ class SecurityScannerAgent(BaseAgent):
     def mission(self) -> str:
         return self.get_instructions_section("## Mission")
 
-    def __init__(self, *args, target_owner: str = "juninmd", **kwargs):
+    def __init__(
+        self,
+        *args,
+        target_owner: str = "juninmd",
+        max_workers: int | None = None,
+        full_history: bool | None = None,
+        checkpoint_path: str | None = None,
+        scratch_dir: str | None = None,
+        cache_dir: str | None = None,
+        scan_depth: int | None = None,
+        **kwargs,
+    ):
         super().__init__(
             *args, name="security_scanner", enforce_repository_allowlist=False, **kwargs
         )
         self.target_owner = target_owner
+        # Each scan is a clone + gitleaks subprocess, so threads are enough to overlap them.
+        self.max_workers = (
+            max_workers
+            or _scanner.env_int("SECURITY_SCANNER_WORKERS", 0)
+            or _DEFAULT_SCAN_WORKERS
+        )
+        # Tip-only scans are far cheaper to clone but skip secrets buried in history.
+        if full_history is None:
+            full_history = os.getenv("SECURITY_SCANNER_FULL_HISTORY", "true").lower() != "false"
+        self.full_history = full_history
+        # Opt-in: repos whose last scan was clean are only re-audited from that commit on.
+        self.checkpoint_path = checkpoint_path or os.getenv("SECURITY_SCANNER_CHECKPOINT_FILE")
+        self._checkpoints: dict[str, dict[str, Any]] = {}
+        self._gitleaks_ready: bool | None = None
+        # e.g. /dev/shm: clones are written and deleted per repo, so RAM-backed space avoids disk I/O.
+        self.scratch_dir = scratch_dir or os.getenv("SECURITY_SCANNER_SCRATCH_DIR")
+        # Persistent bare mirrors: later runs fetch only new commits instead of re-cloning.
+        cache_dir = cache_dir or os.getenv("SECURITY_SCANNER_CACHE_DIR")
+        self.cache_dir = os.path.expanduser(cache_dir) if cache_dir else None
+        # Bound history scans to the newest N commits (0/unset: the whole history).
+        self.scan_depth = scan_depth or _scanner.env_int("SECURITY_SCANNER_SCAN_DEPTH", 0) or None
         self._commit_author_cache: dict[str, str] = {}
 
     # ------------------------------------------------------------------
@@ -38,14 +84,42 @@ class SecurityScannerAgent(BaseAgent):
     # ------------------------------------------------------------------
 
     def _ensure_gitleaks_installed(self) -> bool:
-        return _scanner.ensure_gitleaks_installed(self.log)
+        # Probe (and possibly install) once per agent instead of forking on every call.
+        if self._gitleaks_ready is None:
+            self._gitleaks_ready = _scanner.ensure_gitleaks_installed(self.log)
+        return self._gitleaks_ready
 
     def _scan_repository(self, repo_name: str, default_branch: str = "main") -> dict[str, Any]:
-        return _scanner.scan_repository(repo_name, default_branch, self.log)
+        checkpoint = self._checkpoints.get(repo_name, {})
+        if checkpoint and not _scanner.checkpoint_covers(
+            checkpoint, self.full_history, self.scan_depth
+        ):
+            self.log(f"Ignoring checkpoint for {repo_name}: it covers less than this scan")
+            checkpoint = {}
+        return _scanner.scan_repository(
+            repo_name,
+            default_branch,
+            self.log,
+            full_history=self.full_history,
+            incremental=bool(self.checkpoint_path),
+            since_sha=checkpoint.get("sha"),
+            scratch_dir=self.scratch_dir,
+            cache_dir=self.cache_dir,
+            max_commits=self.scan_depth,
+        )
 
     def _sanitize_findings(self, findings: list[dict]) -> list[dict]:
         return _scanner.sanitize_findings(findings)
 
+    def _load_checkpoint(self) -> dict[str, dict[str, Any]]:
+        if not self.checkpoint_path:
+            return {}
+        return _scanner.load_checkpoints(self.checkpoint_path, self.log)
+
+    def _save_checkpoint(self) -> None:
+        if self.checkpoint_path:
+            _scanner.save_checkpoints(self.checkpoint_path, self._checkpoints, self.log)
+
     # ------------------------------------------------------------------
     # Orchestration
     # ------------------------------------------------------------------
@@ -82,11 +156,17 @@ class SecurityScannerAgent(BaseAgent):
             self._send_notification(results)
             return results
 
-        for repo_info in repositories:
+        self._checkpoints = self._load_checkpoint()
+        if self.full_history or self.checkpoint_path:
+            scans = self._scan_all_repositories(repositories)
+        else:
+            # Tip-only scans have no per-repo git history to walk, so one gitleaks run covers all.
+            scans = [_resolved(r) for r in self._scan_batch(repositories)]
+        for repo_info, scan in zip(repositories, scans, strict=True):
             repo_name = repo_info["name"]
             default_branch = repo_info["default_branch"]
             try:
-                scan_result = self._scan_repository(repo_name, default_branch)
+                scan_result = scan.result()
                 if scan_result["scanned"]:
                     results["scanned"] += 1
                     if scan_result["findings"]:
@@ -96,6 +176,15 @@ class SecurityScannerAgent(BaseAgent):
                             "default_branch": default_branch,
                             "findings": scan_result["findings"],
                         })
+                    elif scan_result.get("head_sha"):
+                        # Only clean scans advance the checkpoint, so findings keep resurfacing.
+                        # Record what was covered so a wider scan never trusts a narrower one.
+                        self._checkpoints[repo_name] = {
+                            "sha": scan_result["head_sha"],
+                            "scanned_at": results["timestamp"],
+                            "mode": "full" if self.full_history else "tip",
+                            "depth": self.scan_depth if self.full_history else None,
+                        }
                 else:
                     results["failed"] += 1
                     if scan_result["error"]:
@@ -107,6 +196,7 @@ class SecurityScannerAgent(BaseAgent):
                 results["failed"] += 1
                 results["scan_errors"].append({"repository": repo_name, "error": str(e)})
 
+        self._save_checkpoint()
         self.log(
             f"Scan completed: {results['scanned']} scanned, "
             f"{results['failed']} failed, {results['total_findings']} findings"
@@ -114,24 +204,51 @@ class SecurityScannerAgent(BaseAgent):
         self._send_notification(results)
         return results
 
+    def _scan_all_repositories(self, repositories: list[dict[str, str]]) -> list[Future]:
+        """Scan *repositories* concurrently; futures are returned in input order."""
+        workers = min(self.max_workers, len(repositories))
+        self.log(f"Scanning {len(repositories)} repositories with {workers} workers")
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return [
+                pool.submit(self._scan_repository, r["name"], r["default_branch"])
+                for r in repositories
+            ]
+
+    def _scan_batch(self, repositories: list[dict[str, str]]) -> list[dict[str, Any]]:
+        """Tip-only scan of *repositories* with a single gitleaks invocation."""
+        return _scanner.scan_batch(
+            repositories, self.log, scratch_dir=self.scratch_dir, max_workers=self.max_workers
+        )
+
     def _get_all_repositories(self) -> list[dict[str, str]]:
         """Combine allowlist repos with all repos owned by target_owner."""
         try:
-            repo_names = self.get_allowed_repositories()
-            repos = []
-            for repo_name in repo_names:
-                try:
-                    r = self.github_client.get_repo(repo_name)
-                    repos.append({"name": repo_name, "default_branch": r.default_branch})
-                except Exception as e:
-                    self.log(f"Error fetching repo {repo_name}: {e}", "WARNING")
-
-            self.log(f"Found {len(repos)} repositories to scan for {self.target_owner}")
-            return repos
+            allowlisted = self.allowlist.list_repositories()
         except Exception as e:
             self.log(f"Error fetching repositories: {e}", "ERROR")
             return []
 
+        branches: dict[str, str] = {}
+        # The paginated listing already carries default_branch, so owned repos need no per-repo call.
+        # Unfiltered on purpose: target_owner may be an org or another login the token can access.
+        try:
+            for r in self.github_client.g.get_user().get_repos():
+                if r.owner.login == self.target_owner:
+                    branches[r.full_name] = r.default_branch
+        except Exception as e:
+            self.log(f"Error listing repositories for {self.target_owner}: {e}", "WARNING")
+
+        for repo_name in allowlisted:
+            if repo_name in branches:
+                continue
+            try:
+                branches[repo_name] = self.github_client.get_repo(repo_name).default_branch
+            except Exception as e:
+                self.log(f"Error fetching repo {repo_name}: {e}", "WARNING")
+
+        self.log(f"Found {len(branches)} repositories to scan for {self.target_owner}")
+        return [{"name": name, "default_branch": branch} for name, branch in branches.items()]
+
     def _get_commit_author(self, repo_name: str, commit_sha: str) -> str:
         """Resolve commit SHA to GitHub username, with caching."""
         if not commit_sha:
@@ -151,11 +268,20 @@ class SecurityScannerAgent(BaseAgent):
         self._commit_author_cache[cache_key] = author_login
         return author_login
 
+    def _prefetch_commit_authors(self, pairs: list[tuple[str, str]]) -> None:
+        """Resolve uncached commit authors concurrently so the report only hits the cache."""
+        pending = [(r, sha) for r, sha in pairs if f"{r}:{sha}" not in self._commit_author_cache]
+        if not pending:
+            return
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pending))) as pool:
+            list(pool.map(lambda pair: self._get_commit_author(*pair), pending))
+
     # ------------------------------------------------------------------
     # Delegated notification helpers
     # ------------------------------------------------------------------
 
     def _send_notification(self, results: dict[str, Any]) -> None:
+        self._prefetch_commit_authors(commits_to_resolve(results))
         build_and_send_report(results, self.telegram, self.target_owner, self._get_commit_author)
 
     def _send_error_notification(self, error_message: str) -> None:
@@ -1,26 +1,48 @@
 """Telegram notification helpers for the Security Scanner Agent."""
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Iterator
 from typing import Any
-from urllib.parse import quote
 
+from src.agents.secret_remover.utils import build_file_line_url
 from src.notifications.telegram import TelegramNotifier
 
 _MAX_LEN = 3800
-
-
-def _send_lines(lines: list[str], telegram: TelegramNotifier) -> None:
-    """Chunk *lines* into ≤ _MAX_LEN messages and send each via Telegram."""
-    current = ""
+_CONTINUATION_HEADER = "⚠️ *Continuação...*"
+# The common outcome: nothing found and nothing failed, sent as one pre-built message.
+_CLEAN_REPORT_TEMPLATE = (
+    "🔐 *Relatório do Security Scanner*\n\n"
+    "✅ Nenhum segredo encontrado em {scanned}/{total} repositórios\\.\n"
+    "👤 Dono: `{owner}`"
+)
+# Repos beyond this many get one attached text file instead of one message (and RTT) each.
+_MAX_REPO_MESSAGES = 5
+_MAX_FINDINGS_DISPLAYED = 10
+# Closes a repo block whose findings were cut at _MAX_FINDINGS_DISPLAYED.
+_MORE_FINDINGS_TEMPLATE = "  \\+ {count} outros achados\\.\\.\\."
+
+
+def _iter_message_chunks(lines: Iterable[str], telegram: TelegramNotifier) -> Iterator[str]:
+    """Yield ≤ _MAX_LEN messages from *lines*, holding at most one message in memory."""
+    # Buffer the in-flight message as parts plus its joined length to avoid repeated concatenation.
+    parts: list[str] = []
+    length = 0
     for ln in lines:
         if len(ln) > _MAX_LEN:
             ln = telegram._truncate(ln)
-        if current and len(current) + len(ln) + 1 > _MAX_LEN:
-            telegram.send_message(current, parse_mode="MarkdownV2")
-            current = "⚠️ *Continuação...*\n" + ln
+        if parts and length + len(ln) + 1 > _MAX_LEN:
+            yield "\n".join(parts)
+            parts = [_CONTINUATION_HEADER, ln]
+            length = len(_CONTINUATION_HEADER) + 1 + len(ln)
         else:
-            current = (current + "\n" + ln) if current else ln
-    if current:
-        telegram.send_message(current, parse_mode="MarkdownV2")
+            length += len(ln) + 1 if parts else len(ln)
+            parts.append(ln)
+    if parts:
+        yield "\n".join(parts)
+
+
+def _send_lines(lines: Iterable[str], telegram: TelegramNotifier) -> None:
+    """Chunk *lines* into ≤ _MAX_LEN messages and send each via Telegram."""
+    for chunk in _iter_message_chunks(lines, telegram):
+        telegram.send_message(chunk, parse_mode="MarkdownV2")
 
 
 def build_and_send_report(
@@ -38,6 +60,17 @@ def build_and_send_report(
     """
     esc = telegram.escape
 
+    if not results["total_findings"] and not results["failed"] and not results["scan_errors"]:
+        telegram.send_message(
+            _CLEAN_REPORT_TEMPLATE.format(
+                scanned=results["scanned"],
+                total=results["total_repositories"],
+                owner=esc(target_owner),
+            ),
+            parse_mode="MarkdownV2",
+        )
+        return
+
     header = (
         "🔐 *Relatório do Security Scanner*\n\n"
         f"📊 *Repos escaneados:* {results['scanned']}/{results['total_repositories']}\n"
@@ -48,24 +81,54 @@ def build_and_send_report(
     )
     _send_lines([header], telegram)
 
-    repos_with_findings = sorted(
-        results["repositories_with_findings"],
-        key=lambda x: len(x["findings"]),
-        reverse=True,
-    )
+    repos_with_findings = _ranked_repos(results)
 
-    for repo_data in repos_with_findings:
+    for repo_data in repos_with_findings[:_MAX_REPO_MESSAGES]:
         repo_name = repo_data["repository"]
         findings = repo_data["findings"]
         _send_repo_block(repo_name, findings, telegram, esc, get_author_fn)
 
+    overflow = repos_with_findings[_MAX_REPO_MESSAGES:]
+    if overflow:
+        telegram.send_document(
+            "security-findings.txt",
+            _format_overflow_report(overflow),
+            caption=f"+{len(overflow)} repositórios com achados",
+        )
+
     if results["scan_errors"]:
-        error_lines = [f"❌ *Erros de Scan \\({len(results['scan_errors'])}\\):*"]
-        for error in results["scan_errors"]:
-            repo_short = error["repository"].split("/")[-1]
-            error_msg = error["error"][:40]
-            error_lines.append(f"  • {esc(repo_short)}: {esc(error_msg)}")
-        _send_lines(error_lines, telegram)
+        _send_lines(_iter_error_lines(results["scan_errors"], esc), telegram)
+
+
+def _ranked_repos(results: dict[str, Any]) -> list[dict[str, Any]]:
+    """Repos with findings, most findings first (the order the report uses)."""
+    return sorted(
+        results["repositories_with_findings"],
+        key=lambda x: len(x["findings"]),
+        reverse=True,
+    )
+
+
+def commits_to_resolve(results: dict[str, Any]) -> list[tuple[str, str]]:
+    """Unique ``(repo, commit)`` pairs whose authors the report will display."""
+    pairs: dict[tuple[str, str], None] = {}
+    for repo_data in _ranked_repos(results)[:_MAX_REPO_MESSAGES]:
+        for finding in repo_data["findings"][:_MAX_FINDINGS_DISPLAYED]:
+            sha = finding.get("full_commit") or finding.get("commit", "")
+            if sha:
+                pairs[(repo_data["repository"], sha)] = None
+    return list(pairs)
+
+
+def _iter_error_lines(
+    scan_errors: list[dict[str, Any]],
+    esc: Callable[[str | None], str],
+) -> Iterator[str]:
+    """Yield the scan-error section line by line, so it is never built as one list."""
+    yield f"❌ *Erros de Scan \\({len(scan_errors)}\\):*"
+    for error in scan_errors:
+        repo_short = error["repository"].split("/")[-1]
+        yield f"  • {esc(repo_short)}: {esc(error['error'][:40])}"
 
 
 def _send_repo_block(
@@ -78,8 +141,7 @@ def _send_repo_block(
     """Send a single repo's findings as one Telegram message with a button."""
     lines = [f"📦 *{esc(repo_name)}* \\({len(findings)} achados\\):"]
 
-    max_displayed = 10
-    for finding in findings[:max_displayed]:
+    for finding in findings[:_MAX_FINDINGS_DISPLAYED]:
         rule_id = esc(finding["rule_id"])
         file_path = finding["file"]
         line_no = finding["line"]
@@ -91,14 +153,12 @@ def _send_repo_block(
         else:
             author_link = "unknown"
 
-        encoded_path = quote(file_path, safe="/")
         # Use the commit hash for a stable, branch-independent permalink
-        ref = full_commit if full_commit else "HEAD"
-        vuln_url = f"https://github.com/{repo_name}/blob/{ref}/{encoded_path}#L{line_no}"
+        vuln_url = build_file_line_url(repo_name, full_commit or "HEAD", file_path, line_no)
         lines.append(f"  • [{rule_id}]({vuln_url}) — {author_link}")
 
-    if len(findings) > max_displayed:
-        lines.append(f"  \\+ {len(findings) - max_displayed} outros achados\\.\\.\\.")
+    if len(findings) > _MAX_FINDINGS_DISPLAYED:
+        lines.append(_MORE_FINDINGS_TEMPLATE.format(count=len(findings) - _MAX_FINDINGS_DISPLAYED))
 
     text = "\n".join(lines)
     if len(text) > _MAX_LEN:
@@ -112,6 +172,20 @@ def _send_repo_block(
     telegram.send_message(text, parse_mode="MarkdownV2", reply_markup=inline_keyboard)
 
 
+def _format_overflow_report(repos: list[dict[str, Any]]) -> str:
+    """Plain-text listing of every finding in *repos*, for a single document upload."""
+    lines: list[str] = []
+    for repo_data in repos:
+        repo_name = repo_data["repository"]
+        lines.append(f"{repo_name} ({len(repo_data['findings'])} achados)")
+        for finding in repo_data["findings"]:
+            ref = finding.get("full_commit") or finding.get("commit") or "HEAD"
+            url = build_file_line_url(repo_name, ref, finding["file"], finding["line"])
+            lines.append(f"  - {finding['rule_id']}: {finding['file']}:{finding['line']} {url}")
+        lines.append("")
+    return "\n".join(lines)
+
+
 def send_error_notification(
     telegram: TelegramNotifier,
     target_owner: str,
@@ -13,6 +13,8 @@ class GithubClient:
         self.g = Github(
             self.token,
             timeout=300,
+            # GitHub's maximum page size: listing N repos/PRs costs ceil(N/100) requests, not N/30.
+            per_page=100,
             retry=Retry(total=3, backoff_factor=1, status_forcelist=[500, 502, 503]),
         )
 
@@ -3,6 +3,9 @@ import requests
 
 from src.utils.retry import with_retry
 
+# Every MarkdownV2 special character mapped to its backslash-escaped form, for one-pass escaping.
+_MARKDOWN_V2_ESCAPES = str.maketrans({c: f"\\{c}" for c in "\\_*[]()~`>#+-=|{}.!"})
+
 
 def _is_telegram_retryable(exc: Exception) -> bool:
     if isinstance(exc, requests.HTTPError):
@@ -31,13 +34,7 @@ class TelegramNotifier:
         """Escape special characters for Telegram MarkdownV2."""
         if not text:
             return ""
-        special_chars = [
-            '\\', '_', '*', '[', ']', '(', ')', '~',
-            '`', '>', '#', '+', '-', '=', '|', '{', '}', '.', '!',
-        ]
-        for char in special_chars:
-            text = text.replace(char, f'\\{char}')
-        return text
+        return text.translate(_MARKDOWN_V2_ESCAPES)
 
     @staticmethod
     def escape_html(text: str | None) -> str:
@@ -102,6 +99,31 @@ class TelegramNotifier:
             print(f"Failed to send Telegram message: {e}")
             return False
 
+    def send_document(self, filename: str, content: str, caption: str | None = None) -> bool:
+        """Send *content* as a text file attachment; one request regardless of its length."""
+        if not self.enabled:
+            print("Telegram credentials missing. Skipping notification.")
+            return False
+        return self._post_document(filename, content, caption)
+
+    @with_retry(max_attempts=3, base_delay=2.0, retryable=_is_telegram_retryable)
+    def _post_document(self, filename: str, content: str, caption: str | None) -> bool:
+        data: dict = {"chat_id": self.chat_id}
+        if caption:
+            data["caption"] = caption[:1024]
+        try:
+            response = requests.post(
+                f"https://api.telegram.org/bot{self.bot_token}/sendDocument",
+                data=data,
+                files={"document": (filename, content.encode("utf-8"), "text/plain")},
+                timeout=30,
+            )
+            response.raise_for_status()
+            return True
+        except Exception as e:
+            print(f"Failed to send Telegram document: {e}")
+            return False
+
     def send_pr_notification(self, pr) -> None:
         """Send a notification about a merged PR with inline button."""
         title = pr.title
@@ -0,0 +1,41 @@
+"""Shared pytest fixtures; plain test doubles and builders live in tests/helpers.py."""
+import sys
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from tests.helpers import make_pr_agent
+
+
+@pytest.fixture
+def pr_agent():
+    """PRAssistantAgent wired to MagicMock collaborators, with no real AI client."""
+    return make_pr_agent()
+
+
+@pytest.fixture
+def captured_logs(pr_agent):
+    """Collect ``(level, message)`` pairs logged by ``pr_agent`` instead of printing them."""
+    records: list[tuple[str, str]] = []
+    pr_agent._logger = lambda message, level="INFO": records.append((level, message))
+    return records
+
+
+@pytest.fixture
+def posted_comments(pr_agent):
+    """Record ``(pr, body)`` for every ``github_client.comment_on_pr`` call made by ``pr_agent``."""
+    comments: list[tuple[Any, str]] = []
+    pr_agent.github_client.comment_on_pr = lambda pr, body: comments.append((pr, body))
+    return comments
+
+
+@pytest.fixture
+def cli(monkeypatch, request):
+    """Return a setter for ``sys.argv``; the program name is the test module's ``CLI_PROG``."""
+    prog = getattr(request.module, "CLI_PROG", "run-agent")
+
+    def _set(*args):
+        monkeypatch.setattr(sys, "argv", [prog, *args])
+
+    return _set
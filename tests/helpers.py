@@ -0,0 +1,99 @@
+"""Shared test doubles and builders, imported by test modules as ``tests.helpers``."""
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from src.agents.pr_assistant.agent import PRAssistantAgent
+from src.config.repository_allowlist import RepositoryAllowlist
+from src.github_client import GithubClient
+from src.jules.client import JulesClient
+from src.notifications.telegram import TelegramNotifier
+
+
+def make_result(i: int, **extra) -> dict:
+    """Build a PR Assistant result entry (as appended to ``results[...]``) for PR ``i``."""
+    return {"repository": f"repo{i}", "pr": i, "title": f"PR {i}", **extra}
+
+
+class SearchList(list):
+    """List stand-in for PyGithub's ``PaginatedList`` search results."""
+
+    def __init__(self, items=()):
+        super().__init__(items)
+        self.totalCount = len(self)
+
+
+@dataclass
+class FakeUser:
+    login: str
+
+
+JUNINMD_USER = FakeUser("juninmd")
+
+
+@dataclass
+class FakeRepo:
+    full_name: str = "owner/repo"
+    id: int = 1
+    clone_url: str = "https://github.com/owner/repo.git"
+
+
+@dataclass
+class FakeRef:
+    repo: FakeRepo = field(default_factory=FakeRepo)
+    ref: str = "main"
+    sha: str = "abc123"
+
+
+@dataclass
+class FakeIssue:
+    number: int
+    title: str = ""
+    repository: FakeRepo = field(default_factory=FakeRepo)
+
+
+@dataclass
+class FakePR:
+    """Attribute-only stand-in for a PyGithub ``PullRequest``."""
+
+    number: int = 1
+    title: str = "PR 1"
+    user: FakeUser | None = None
+    base: FakeRef = field(default_factory=FakeRef)
+    head: FakeRef = field(default_factory=lambda: FakeRef(ref="feature"))
+    mergeable: bool | None = True
+    draft: bool = False
+    html_url: str = "https://github.com/owner/repo/pull/1"
+    created_at: datetime | None = None
+    labels: list[Any] = field(default_factory=list)
+    comments: list[Any] = field(default_factory=list)
+
+    def get_labels(self) -> list[Any]:
+        return self.labels
+
+    def get_issue_comments(self) -> list[Any]:
+        return self.comments
+
+
+def make_pr(**overrides) -> FakePR:
+    """Build a FakePR authored by ``juninmd`` unless ``user`` is overridden."""
+    overrides.setdefault("user", JUNINMD_USER)
+    return FakePR(**overrides)
+
+
+def make_pr_agent() -> PRAssistantAgent:
+    """PRAssistantAgent wired to MagicMock collaborators, with no real AI client."""
+    github_client = MagicMock(spec=GithubClient)
+    # Happy-path defaults for the tuple-returning calls; tests override only what they exercise.
+    github_client.accept_review_suggestions.return_value = (True, "No suggestions", 0)
+    github_client.merge_pr.return_value = (True, "Merged successfully")
+    with patch("src.agents.pr_assistant.agent.get_ai_client"):
+        return PRAssistantAgent(
+            github_client=github_client,
+            jules_client=MagicMock(spec=JulesClient),
+            telegram=MagicMock(spec=TelegramNotifier),
+            allowlist=MagicMock(spec=RepositoryAllowlist),
+            target_owner="test_owner",
+            min_pr_age_minutes=10,
+        )
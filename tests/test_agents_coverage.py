@@ -1,10 +1,14 @@
 import unittest
-from datetime import UTC, datetime, timedelta, timezone  # pyright: ignore[reportUnusedImport]
-from unittest.mock import MagicMock, patch
+from datetime import UTC, datetime, timedelta
+from unittest.mock import MagicMock
 
 from src.agents.ci_health.agent import CIHealthAgent
 from src.agents.pr_sla.agent import PRSLAAgent
 from src.notifications.telegram import TelegramNotifier
+from tests.helpers import FakeIssue, SearchList
+
+# Older than the 24h staleness threshold used by the CI health and PR SLA agents.
+STALE_TIME = datetime.now(UTC) - timedelta(hours=25)
 
 
 class TestAgentsCoverage(unittest.TestCase):
@@ -26,10 +30,9 @@ class TestAgentsCoverage(unittest.TestCase):
         self.assertEqual(agent.telegram.escape(None), "")
 
         # Test persona/mission
-        with patch.object(agent, "get_instructions_section") as mock_instr:
-            mock_instr.return_value = "Content"
-            self.assertEqual(agent.persona, "Content")
-            self.assertEqual(agent.mission, "Content")
+        agent.get_instructions_section = lambda section_header: "Content"
+        self.assertEqual(agent.persona, "Content")
+        self.assertEqual(agent.mission, "Content")
 
         # Test run with failures
         mock_repo = MagicMock()
@@ -47,7 +50,7 @@ class TestAgentsCoverage(unittest.TestCase):
         mock_run.html_url = "http://url"
 
         mock_old_run = MagicMock()
-        mock_old_run.created_at = datetime.now(UTC) - timedelta(hours=25)
+        mock_old_run.created_at = STALE_TIME
 
         mock_repo.get_workflow_runs.return_value = [mock_run, mock_old_run]
 
@@ -70,23 +73,21 @@ class TestAgentsCoverage(unittest.TestCase):
         agent = PRSLAAgent(self.jules_client, self.github_client, self.allowlist, telegram=self.telegram, target_owner="testuser")
 
         # Test persona/mission/escape explicit
-        with patch.object(agent, "get_instructions_section") as mock_instr:
-            mock_instr.return_value = "Content"
-            self.assertEqual(agent.persona, "Content")
-            self.assertEqual(agent.mission, "Content")
+        agent.get_instructions_section = lambda section_header: "Content"
+        self.assertEqual(agent.persona, "Content")
+        self.assertEqual(agent.mission, "Content")
         self.assertEqual(agent.telegram.escape(None), "")
 
         # Test run
-        mock_issue = MagicMock()
         mock_pr = MagicMock()
-        mock_pr.updated_at = datetime.now(UTC) - timedelta(hours=25)
-        mock_pr.created_at = datetime.now(UTC) - timedelta(hours=25)
+        mock_pr.updated_at = STALE_TIME
+        mock_pr.created_at = STALE_TIME
         mock_pr.base.repo.full_name = "owner/repo"
         mock_pr.number = 1
         mock_pr.title = "Stale PR"
         mock_pr.html_url = "http://url"
 
-        self.github_client.search_prs.return_value = [mock_issue]
+        self.github_client.search_prs.return_value = SearchList([FakeIssue(1)])
         self.github_client.get_pr_from_issue.return_value = mock_pr
 
         result = agent.run()
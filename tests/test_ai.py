@@ -1,8 +1,6 @@
 """Tests for the modular AI package."""
 import unittest
 from unittest.mock import MagicMock, patch
-import pytest
-import requests
 from src.ai import get_ai_client, AIClient, GeminiClient, OllamaClient, OpenAIClient
 
 
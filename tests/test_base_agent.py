@@ -1,4 +1,5 @@
 import unittest
+from datetime import UTC, datetime, timedelta
 from unittest.mock import ANY, MagicMock, mock_open, patch
 
 from src.agents.base_agent import BaseAgent
@@ -6,6 +7,11 @@ from src.config.repository_allowlist import RepositoryAllowlist
 from src.github_client import GithubClient
 from src.jules.client import JulesClient
 
+# Jules session timestamps (ISO, "Z" suffix) relative to import time.
+_NOW = datetime.now(UTC)
+OLD_SESSION_TIME = (_NOW - timedelta(hours=48)).isoformat().replace("+00:00", "Z")
+RECENT_SESSION_TIME = (_NOW - timedelta(hours=2)).isoformat().replace("+00:00", "Z")
+
 
 class TestBaseAgent(unittest.TestCase):
     def setUp(self):
@@ -201,16 +207,11 @@ Test Mission Content
         self.assertFalse(self.agent.has_recent_jules_session("repo"))
 
     def test_has_recent_jules_session_logic(self):
-        from datetime import UTC, datetime, timedelta
-        now = datetime.now(UTC)
-        old_date = (now - timedelta(hours=48)).isoformat().replace("+00:00", "Z")
-        recent_date = (now - timedelta(hours=2)).isoformat().replace("+00:00", "Z")
-
         self.mock_jules.list_sessions.return_value = [
             {"id": "1", "title": "other"},
-            {"id": "2", "createTime": old_date, "title": "Update repo test"},
+            {"id": "2", "createTime": OLD_SESSION_TIME, "title": "Update repo test"},
             {"id": "3", "createdAt": "invalid-date", "title": "Update repo task"},
-            {"id": "4", "createTime": recent_date, "title": "Update repo task"},
+            {"id": "4", "createTime": RECENT_SESSION_TIME, "title": "Update repo task"},
         ]
         self.assertTrue(self.agent.has_recent_jules_session("repo", "task"))
 
@@ -240,11 +241,8 @@ Test Mission Content
         self.assertFalse(self.agent.has_recent_jules_session("repo"))
 
     def test_has_recent_jules_session_logic_coverage(self):
-        from datetime import UTC, datetime, timedelta
-        now = datetime.now(UTC)
-        old_date = (now - timedelta(hours=48)).isoformat().replace("+00:00", "Z")
         self.mock_jules.list_sessions.return_value = [
-            {"id": "2", "createTime": old_date, "title": "Update repo task"},
+            {"id": "2", "createTime": OLD_SESSION_TIME, "title": "Update repo task"},
             {"id": "3", "createdAt": "invalid-date", "title": "Update repo task"},
             {"id": "5", "createTime": None, "title": "test"},
         ]
@@ -2,29 +2,40 @@
 import unittest
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 from src.agents.code_reviewer.agent import CodeReviewerAgent
 from src.config.repository_allowlist import RepositoryAllowlist
 from src.github_client import GithubClient
 from src.jules.client import JulesClient
 from src.notifications.telegram import TelegramNotifier
 
+# Keep the class on one xdist worker so setUpClass builds the agent only once.
+pytestmark = pytest.mark.xdist_group(name="code_reviewer")
+
 
 class TestCodeReviewerAgent(unittest.TestCase):
-    def setUp(self):
-        self.jules_client = MagicMock(spec=JulesClient)
-        self.github_client = MagicMock(spec=GithubClient)
-        self.allowlist = MagicMock(spec=RepositoryAllowlist)
-        self.telegram = MagicMock(spec=TelegramNotifier)
-
-        self.agent = CodeReviewerAgent(
-            jules_client=self.jules_client,
-            github_client=self.github_client,
-            allowlist=self.allowlist,
-            telegram=self.telegram,
+    @classmethod
+    def setUpClass(cls):
+        # No test mutates the agent itself, so build it once and only reset the mocks per test.
+        cls.jules_client = MagicMock(spec=JulesClient)
+        cls.github_client = MagicMock(spec=GithubClient)
+        cls.allowlist = MagicMock(spec=RepositoryAllowlist)
+        cls.telegram = MagicMock(spec=TelegramNotifier)
+
+        cls.agent = CodeReviewerAgent(
+            jules_client=cls.jules_client,
+            github_client=cls.github_client,
+            allowlist=cls.allowlist,
+            telegram=cls.telegram,
             ai_provider="gemini",
             ai_model="gemini-2.5-flash",
         )
 
+    def setUp(self):
+        for mock in (self.jules_client, self.github_client, self.allowlist, self.telegram):
+            mock.reset_mock(return_value=True, side_effect=True)
+
     def test_init(self):
         self.assertEqual(self.agent.name, "code_reviewer")
         self.assertEqual(self.agent.ai_provider, "gemini")
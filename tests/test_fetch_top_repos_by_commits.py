@@ -0,0 +1,146 @@
+import json
+import os
+import sys
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+# Add tools directory to path to import fetch_top_repos_by_commits
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'tools')))
+import fetch_top_repos_by_commits as fetch  # pyright: ignore[reportMissingImports]
+
+
+def _response(status_code=200, body=b"", headers=None):
+    return SimpleNamespace(
+        status_code=status_code,
+        content=body,
+        headers=headers or {},
+        raise_for_status=lambda: None,
+    )
+
+
+class FakeSession:
+    """Session double that replays queued responses and records each call's arguments."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.calls.append((url, headers))
+        return self.responses.pop(0)
+
+    def post(self, url, json=None, timeout=None):
+        self.calls.append((url, json))
+        return self.responses.pop(0)
+
+
+def test_request_json_serves_cached_body_on_304(tmp_path):
+    url = "https://api.github.com/repos/o/r/contributors?per_page=100"
+    cache = fetch.ResponseCache(str(tmp_path / "cache.sqlite3"))
+    session = FakeSession(
+        _response(body=b'[{"contributions": 3}]', headers={"ETag": '"v1"', "Link": None}),
+        _response(status_code=304),
+    )
+    try:
+        first = fetch.request_json(session, url, cache)
+        second = fetch.request_json(session, url, cache)
+    finally:
+        cache.close()
+
+    assert first[0] == second[0] == [{"contributions": 3}]
+    assert (first[2], second[2]) == (False, True)
+    assert session.calls[1][1] == {"If-None-Match": '"v1"'}
+
+
+def test_rate_limiter_backs_off_below_ten_percent_budget():
+    limiter = fetch.RateLimiter(1000)
+    with patch.object(fetch.time, "sleep") as mock_sleep:
+        limiter.observe({
+            "X-RateLimit-Remaining": "4000", "X-RateLimit-Limit": "5000",
+            "X-RateLimit-Reset": str(time.time() + 100),
+        })
+        limiter.wait()
+        mock_sleep.assert_not_called()
+
+        limiter.observe({
+            "X-RateLimit-Remaining": "4", "X-RateLimit-Limit": "5000",
+            "X-RateLimit-Reset": str(time.time() + 2),
+        })
+        limiter.wait()
+
+    # Two seconds to the reset spread over the four requests left.
+    assert mock_sleep.call_args.args[0] == pytest.approx(0.5, abs=0.05)
+
+
+@pytest.mark.parametrize("rate", ["0", "-5", "nan"])
+def test_rate_option_rejects_non_positive_values(rate, capsys):
+    with patch.object(sys, "argv", ["fetch", "--user", "o", "--rate", rate]), pytest.raises(SystemExit):
+        fetch.main()
+    assert "--rate" in capsys.readouterr().err
+
+
+def _graphql_page(nodes, has_next=False, cursor=None):
+    data = {"data": {"repositoryOwner": {"repositories": {
+        "pageInfo": {"hasNextPage": has_next, "endCursor": cursor},
+        "nodes": nodes,
+    }}}}
+    return _response(body=json.dumps(data).encode())
+
+
+def test_graphql_paginates_and_counts_empty_repo_as_zero():
+    session = FakeSession(
+        _graphql_page(
+            [{"nameWithOwner": "o/a", "defaultBranchRef": {"target": {"history": {"totalCount": 7}}}}],
+            True, "c1",
+        ),
+        _graphql_page([{"nameWithOwner": "o/empty", "defaultBranchRef": None}]),
+    )
+
+    results = fetch.fetch_commit_counts_graphql(session, "o")
+
+    assert results == [{"full_name": "o/a", "commits": 7}, {"full_name": "o/empty", "commits": 0}]
+    assert [call[1]["variables"]["cursor"] for call in session.calls] == [None, "c1"]
+
+
+def test_graphql_lists_organization_repos():
+    # GraphQL's user(login:) is null for an org; repositoryOwner resolves both kinds of login.
+    session = FakeSession(_graphql_page(
+        [{"nameWithOwner": "acme/api", "defaultBranchRef": {"target": {"history": {"totalCount": 3}}}}]
+    ))
+
+    results = fetch.fetch_commit_counts_graphql(session, "acme")
+
+    assert results == [{"full_name": "acme/api", "commits": 3}]
+    assert "repositoryOwner(login: $login)" in session.calls[0][1]["query"]
+
+
+def test_graphql_unknown_login_raises_clear_error():
+    session = FakeSession(_response(body=b'{"data": {"repositoryOwner": null}}'))
+
+    with pytest.raises(RuntimeError, match="nobody"):
+        fetch.fetch_commit_counts_graphql(session, "nobody")
+
+
+def test_write_json_atomic_keeps_original_when_write_fails(tmp_path):
+    path = tmp_path / "repositories.json"
+    path.write_text('{"repositories": ["o/keep"]}', encoding="utf-8")
+
+    with pytest.raises(TypeError):
+        fetch.write_json_atomic(str(path), {"repositories": [object()]})
+
+    assert json.loads(path.read_text(encoding="utf-8")) == {"repositories": ["o/keep"]}
+    assert os.listdir(tmp_path) == ["repositories.json"]
+
+
+def test_write_json_atomic_removes_temp_file_when_replace_fails(tmp_path):
+    path = tmp_path / "repositories.json"
+    path.write_text('{"repositories": ["o/keep"]}', encoding="utf-8")
+
+    with patch.object(fetch.os, "replace", side_effect=OSError("disk full")), pytest.raises(OSError):
+        fetch.write_json_atomic(str(path), {"repositories": ["o/new"]})
+
+    assert json.loads(path.read_text(encoding="utf-8")) == {"repositories": ["o/keep"]}
+    assert os.listdir(tmp_path) == ["repositories.json"]
@@ -9,22 +9,16 @@ from src.github_client import GithubClient
 
 class TestGithubClient(unittest.TestCase):
     def setUp(self):
-        self.env_patcher = patch.dict(os.environ, {"GITHUB_TOKEN": "token"})
-        self.env_patcher.start()
-
-        self.github_patcher = patch("src.github_client.Github")
-        self.mock_github_cls = self.github_patcher.start()
-        self.mock_github_instance = self.mock_github_cls.return_value
-
-        self.client = GithubClient()
-
-    def tearDown(self):
-        self.env_patcher.stop()
-        self.github_patcher.stop()
+        with patch.dict(os.environ, {"GITHUB_TOKEN": "token"}), \
+             patch("src.github_client.Github") as mock_github_cls:
+            self.mock_github_cls = mock_github_cls
+            self.mock_github_instance = mock_github_cls.return_value
+            self.client = GithubClient()
 
     def test_init(self):
         self.assertEqual(self.client.token, "token")
         self.mock_github_cls.assert_called_once()
+        self.assertEqual(self.mock_github_cls.call_args.kwargs["per_page"], 100)
 
     def test_init_missing_token(self):
         with patch.dict(os.environ, {}, clear=True):
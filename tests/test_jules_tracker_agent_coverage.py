@@ -1,5 +1,4 @@
 
-import os
 import unittest
 from unittest.mock import MagicMock, patch
 
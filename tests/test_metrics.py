@@ -1,6 +1,6 @@
 """Tests for agent metrics module."""
 import unittest
-from datetime import UTC, datetime
+from datetime import datetime
 
 from src.agents.metrics import AgentMetrics
 
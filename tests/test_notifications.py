@@ -13,6 +13,11 @@ class TestTelegramNotifier(unittest.TestCase):
         self.assertEqual(TelegramNotifier.escape(None), "")
         self.assertEqual(TelegramNotifier.escape(""), "")
 
+    def test_escape_all_markdown_v2_specials(self):
+        specials = "\\_*[]()~`>#+-=|{}.!"
+        escaped = TelegramNotifier.escape(f"a{specials}b")
+        self.assertEqual(escaped, "a" + "".join(f"\\{c}" for c in specials) + "b")
+
     def test_enabled_property(self):
         notifier = TelegramNotifier(bot_token="t", chat_id="c")
         self.assertTrue(notifier.enabled)
@@ -31,6 +36,19 @@ class TestTelegramNotifier(unittest.TestCase):
         self.assertTrue(result)
         mock_post.assert_called_once()
 
+    @patch("src.notifications.telegram.requests.post")
+    def test_send_document_uploads_text_file(self, mock_post):
+        notifier = TelegramNotifier(bot_token="bot", chat_id="chat")
+        self.assertTrue(notifier.send_document("report.txt", "line\n", caption="c"))
+        mock_post.assert_called_once()
+        args, kwargs = mock_post.call_args
+        self.assertTrue(args[0].endswith("/sendDocument"))
+        self.assertEqual(kwargs["files"]["document"][:2], ("report.txt", b"line\n"))
+        self.assertEqual(kwargs["data"], {"chat_id": "chat", "caption": "c"})
+
+    def test_send_document_disabled(self):
+        self.assertFalse(TelegramNotifier().send_document("report.txt", "x"))
+
     @patch("src.notifications.telegram.requests.post")
     def test_send_message_failure(self, mock_post):
         mock_post.side_effect = Exception("Error")
@@ -1,8 +1,11 @@
+import contextlib
 import os
 import subprocess
-import pytest
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 from src.agents.pr_assistant.conflict_resolver import (
     _get_conflicted_files,
     _resolve_file_conflicts,
@@ -10,10 +13,25 @@ from src.agents.pr_assistant.conflict_resolver import (
     resolve_conflicts_autonomously,
 )
 
+# Plain result objects for patched subprocess.run — cheaper than a MagicMock per call.
+_GIT_OK = SimpleNamespace(returncode=0, stdout="", stderr="")
+_GIT_FAIL = SimpleNamespace(returncode=1, stdout="", stderr="error")
+_MERGE_CONFLICT = SimpleNamespace(returncode=1, stdout="", stderr="CONFLICT (content)")
+
+
+@pytest.fixture
+def clone_tmpdir(tmp_path, monkeypatch):
+    """Point the resolver's TemporaryDirectory at pytest's tmp_path."""
+    monkeypatch.setattr(
+        "src.agents.pr_assistant.conflict_resolver.tempfile.TemporaryDirectory",
+        lambda: contextlib.nullcontext(str(tmp_path)),
+    )
+    return str(tmp_path)
+
 
 @patch("src.agents.pr_assistant.conflict_resolver.subprocess.run")
 def test_run_git_success(mock_run):
-    mock_run.return_value.returncode = 0
+    mock_run.return_value = _GIT_OK
     result = _run_git(["git", "status"], "/tmp")
     assert result.returncode == 0
     mock_run.assert_called_once()
@@ -21,8 +39,7 @@ def test_run_git_success(mock_run):
 
 @patch("src.agents.pr_assistant.conflict_resolver.subprocess.run")
 def test_run_git_failure(mock_run):
-    mock_run.return_value.returncode = 1
-    mock_run.return_value.stderr = "error"
+    mock_run.return_value = _GIT_FAIL
     with pytest.raises(subprocess.CalledProcessError) as exc_info:
         _run_git(["git", "status"], "/tmp")
     assert exc_info.value.returncode == 1
@@ -30,7 +47,7 @@ def test_run_git_failure(mock_run):
 
 @patch("src.agents.pr_assistant.conflict_resolver.subprocess.run")
 def test_get_conflicted_files(mock_run):
-    mock_run.return_value.stdout = "file1.txt\nfile2.txt\n"
+    mock_run.return_value = SimpleNamespace(returncode=0, stdout="file1.txt\nfile2.txt\n", stderr="")
     files = _get_conflicted_files("/tmp")
     assert files == ["file1.txt", "file2.txt"]
 
@@ -65,14 +82,13 @@ def test_resolve_file_conflicts_exception():
 
 
 @patch("src.agents.pr_assistant.conflict_resolver.get_ai_client")
-@patch("src.agents.pr_assistant.conflict_resolver.tempfile.TemporaryDirectory")
 @patch("src.agents.pr_assistant.conflict_resolver._run_git")
 @patch("src.agents.pr_assistant.conflict_resolver.subprocess.run")
 @patch("src.agents.pr_assistant.conflict_resolver._get_conflicted_files")
 @patch("src.agents.pr_assistant.conflict_resolver.os.path.exists")
 @patch("builtins.open")
 def test_resolve_conflicts_autonomously_success(
-    mock_open, mock_exists, mock_get_conflicts, mock_sub_run, mock_run_git, mock_tempdir, mock_get_ai
+    mock_open, mock_exists, mock_get_conflicts, mock_sub_run, mock_run_git, mock_get_ai, clone_tmpdir
 ):
     pr = MagicMock()
     pr.head.repo.full_name = "owner/repo"
@@ -80,11 +96,7 @@ def test_resolve_conflicts_autonomously_success(
     pr.base.ref = "main"
     pr.head.ref = "feature"
 
-    mock_tempdir.return_value.__enter__.return_value = "/tmp/dir"
-
-    mock_merge_result = MagicMock()
-    mock_merge_result.returncode = 1
-    mock_sub_run.return_value = mock_merge_result
+    mock_sub_run.return_value = _MERGE_CONFLICT
 
     mock_get_conflicts.return_value = ["file1.txt"]
     mock_exists.return_value = True
@@ -102,16 +114,15 @@ def test_resolve_conflicts_autonomously_success(
     assert success is True
     assert "Resolved 1 conflict" in msg
     # Clone goes to subdir, all subsequent git ops use clone_dir
-    expected_clone_dir = os.path.join("/tmp/dir", "repo")
+    expected_clone_dir = os.path.join(clone_tmpdir, "repo")
     mock_run_git.assert_any_call(["git", "push", "origin", "feature"], cwd=expected_clone_dir)
 
 
 @patch("src.agents.pr_assistant.conflict_resolver.get_ai_client")
-@patch("src.agents.pr_assistant.conflict_resolver.tempfile.TemporaryDirectory")
 @patch("src.agents.pr_assistant.conflict_resolver._run_git")
 @patch("src.agents.pr_assistant.conflict_resolver.subprocess.run")
 def test_resolve_conflicts_autonomously_no_conflicts(
-    mock_sub_run, mock_run_git, mock_tempdir, mock_get_ai
+    mock_sub_run, mock_run_git, mock_get_ai, clone_tmpdir
 ):
     pr = MagicMock()
     pr.head.repo.full_name = "owner/repo"
@@ -119,11 +130,7 @@ def test_resolve_conflicts_autonomously_no_conflicts(
     pr.base.ref = "main"
     pr.head.ref = "feature"
 
-    mock_tempdir.return_value.__enter__.return_value = "/tmp/dir"
-
-    mock_merge_result = MagicMock()
-    mock_merge_result.returncode = 0
-    mock_sub_run.return_value = mock_merge_result
+    mock_sub_run.return_value = _GIT_OK
 
     success, msg = resolve_conflicts_autonomously(pr)
 
@@ -132,12 +139,11 @@ def test_resolve_conflicts_autonomously_no_conflicts(
 
 
 @patch("src.agents.pr_assistant.conflict_resolver.get_ai_client")
-@patch("src.agents.pr_assistant.conflict_resolver.tempfile.TemporaryDirectory")
 @patch("src.agents.pr_assistant.conflict_resolver._run_git")
 @patch("src.agents.pr_assistant.conflict_resolver.subprocess.run")
 @patch("src.agents.pr_assistant.conflict_resolver._get_conflicted_files")
 def test_resolve_conflicts_autonomously_no_files_detected(
-    mock_get_conflicts, mock_sub_run, mock_run_git, mock_tempdir, mock_get_ai
+    mock_get_conflicts, mock_sub_run, mock_run_git, mock_get_ai, clone_tmpdir
 ):
     pr = MagicMock()
     pr.head.repo.full_name = "owner/repo"
@@ -145,11 +151,7 @@ def test_resolve_conflicts_autonomously_no_files_detected(
     pr.base.ref = "main"
     pr.head.ref = "feature"
 
-    mock_tempdir.return_value.__enter__.return_value = "/tmp/dir"
-
-    mock_merge_result = MagicMock()
-    mock_merge_result.returncode = 1
-    mock_sub_run.return_value = mock_merge_result
+    mock_sub_run.return_value = _MERGE_CONFLICT
 
     mock_get_conflicts.return_value = []
 
@@ -160,11 +162,10 @@ def test_resolve_conflicts_autonomously_no_files_detected(
 
 
 @patch("src.agents.pr_assistant.conflict_resolver.get_ai_client")
-@patch("src.agents.pr_assistant.conflict_resolver.tempfile.TemporaryDirectory")
 @patch("src.agents.pr_assistant.conflict_resolver._run_git")
 @patch("src.agents.pr_assistant.conflict_resolver.subprocess.run")
 def test_resolve_conflicts_autonomously_timeout(
-    mock_sub_run, mock_run_git, mock_tempdir, mock_get_ai
+    mock_sub_run, mock_run_git, mock_get_ai, clone_tmpdir
 ):
     pr = MagicMock()
     pr.head.repo.full_name = "owner/repo"
@@ -172,7 +173,6 @@ def test_resolve_conflicts_autonomously_timeout(
     pr.base.ref = "main"
     pr.head.ref = "feature"
 
-    mock_tempdir.return_value.__enter__.return_value = "/tmp/dir"
     mock_sub_run.side_effect = subprocess.TimeoutExpired(cmd="git merge", timeout=120)
 
     success, msg = resolve_conflicts_autonomously(pr)
@@ -182,11 +182,10 @@ def test_resolve_conflicts_autonomously_timeout(
 
 
 @patch("src.agents.pr_assistant.conflict_resolver.get_ai_client")
-@patch("src.agents.pr_assistant.conflict_resolver.tempfile.TemporaryDirectory")
 @patch("src.agents.pr_assistant.conflict_resolver._run_git")
 @patch("src.agents.pr_assistant.conflict_resolver.subprocess.run")
 def test_resolve_conflicts_autonomously_exception(
-    mock_sub_run, mock_run_git, mock_tempdir, mock_get_ai
+    mock_sub_run, mock_run_git, mock_get_ai, clone_tmpdir
 ):
     pr = MagicMock()
     pr.head.repo.full_name = "owner/repo"
@@ -194,7 +193,6 @@ def test_resolve_conflicts_autonomously_exception(
     pr.base.ref = "main"
     pr.head.ref = "feature"
 
-    mock_tempdir.return_value.__enter__.return_value = "/tmp/dir"
     mock_sub_run.side_effect = Exception("Git error")
 
     success, msg = resolve_conflicts_autonomously(pr)
@@ -204,14 +202,13 @@ def test_resolve_conflicts_autonomously_exception(
 
 
 @patch("src.agents.pr_assistant.conflict_resolver.get_ai_client")
-@patch("src.agents.pr_assistant.conflict_resolver.tempfile.TemporaryDirectory")
 @patch("src.agents.pr_assistant.conflict_resolver._run_git")
 @patch("src.agents.pr_assistant.conflict_resolver.subprocess.run")
 @patch("src.agents.pr_assistant.conflict_resolver._get_conflicted_files")
 @patch("src.agents.pr_assistant.conflict_resolver.os.path.exists")
 @patch("builtins.open")
 def test_resolve_conflicts_autonomously_no_markers_and_unresolved(
-    mock_open, mock_exists, mock_get_conflicts, mock_sub_run, mock_run_git, mock_tempdir, mock_get_ai
+    mock_open, mock_exists, mock_get_conflicts, mock_sub_run, mock_run_git, mock_get_ai, clone_tmpdir
 ):
     pr = MagicMock()
     pr.head.repo.full_name = "owner/repo"
@@ -219,11 +216,7 @@ def test_resolve_conflicts_autonomously_no_markers_and_unresolved(
     pr.base.ref = "main"
     pr.head.ref = "feature"
 
-    mock_tempdir.return_value.__enter__.return_value = "/tmp/dir"
-
-    mock_merge_result = MagicMock()
-    mock_merge_result.returncode = 1
-    mock_sub_run.return_value = mock_merge_result
+    mock_sub_run.return_value = _MERGE_CONFLICT
 
     mock_get_conflicts.return_value = ["file1.txt", "file2.txt", "file3.txt"]
     mock_exists.side_effect = [False, True, True]
@@ -247,19 +240,18 @@ def test_resolve_conflicts_autonomously_no_markers_and_unresolved(
 
     assert success is True  # One file had no markers = resolved
     assert "Resolved 1 conflict" in msg
-    expected_clone_dir = os.path.join("/tmp/dir", "repo")
+    expected_clone_dir = os.path.join(clone_tmpdir, "repo")
     mock_run_git.assert_any_call(["git", "add", "file2.txt"], cwd=expected_clone_dir)
 
 
 @patch("src.agents.pr_assistant.conflict_resolver.get_ai_client")
-@patch("src.agents.pr_assistant.conflict_resolver.tempfile.TemporaryDirectory")
 @patch("src.agents.pr_assistant.conflict_resolver._run_git")
 @patch("src.agents.pr_assistant.conflict_resolver.subprocess.run")
 @patch("src.agents.pr_assistant.conflict_resolver._get_conflicted_files")
 @patch("src.agents.pr_assistant.conflict_resolver.os.path.exists")
 @patch("builtins.open")
 def test_resolve_conflicts_autonomously_unresolved_zero(
-    mock_open, mock_exists, mock_get_conflicts, mock_sub_run, mock_run_git, mock_tempdir, mock_get_ai
+    mock_open, mock_exists, mock_get_conflicts, mock_sub_run, mock_run_git, mock_get_ai, clone_tmpdir
 ):
     pr = MagicMock()
     pr.head.repo.full_name = "owner/repo"
@@ -267,11 +259,7 @@ def test_resolve_conflicts_autonomously_unresolved_zero(
     pr.base.ref = "main"
     pr.head.ref = "feature"
 
-    mock_tempdir.return_value.__enter__.return_value = "/tmp/dir"
-
-    mock_merge_result = MagicMock()
-    mock_merge_result.returncode = 1
-    mock_sub_run.return_value = mock_merge_result
+    mock_sub_run.return_value = _MERGE_CONFLICT
 
     mock_get_conflicts.return_value = ["file1.txt"]
     mock_exists.return_value = True
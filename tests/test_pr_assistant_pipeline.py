@@ -1,4 +1,6 @@
-from unittest.mock import MagicMock
+from types import SimpleNamespace
+
+import pytest
 
 from src.agents.pr_assistant.pipeline import (
     build_failure_comment,
@@ -7,31 +9,58 @@ from src.agents.pr_assistant.pipeline import (
 )
 
 
+def make_pr_for_repo(repo):
+    """Build a PR whose base repo is ``repo`` and whose head commit sha is ``abc123``."""
+    return SimpleNamespace(head=SimpleNamespace(sha="abc123"), base=SimpleNamespace(repo=repo))
+
+
+def build_pipeline_pr(*, combined_state="success", statuses=(), check_runs=()):
+    """Build a PR whose head commit reports the given combined status and check runs."""
+    combined = SimpleNamespace(
+        state=combined_state, statuses=list(statuses), total_count=len(statuses)
+    )
+    commit = SimpleNamespace(
+        get_combined_status=lambda: combined,
+        get_check_runs=lambda: list(check_runs),
+    )
+    return make_pr_for_repo(SimpleNamespace(get_commit=lambda sha: commit))
+
+
+def make_status(state, context="CI", description="", target_url=""):
+    return SimpleNamespace(
+        state=state, context=context, description=description, target_url=target_url
+    )
+
+
+def _raise_api_error(*_args):
+    raise Exception("API Error")
+
+
+def make_check_run(name, conclusion, status="completed", output=None, html_url=""):
+    return SimpleNamespace(
+        name=name, conclusion=conclusion, status=status, output=output, html_url=html_url
+    )
+
+
 def test_has_existing_failure_comment_true():
-    pr = MagicMock()
-    comment = MagicMock()
-    comment.body = "Some text\n❌ **Pipeline Failure Detected**\nmore text"
-    pr.get_issue_comments.return_value = [comment]
+    comment = SimpleNamespace(body="Some text\n❌ **Pipeline Failure Detected**\nmore text")
+    pr = SimpleNamespace(get_issue_comments=lambda: [comment])
     assert has_existing_failure_comment(pr) is True
 
 
 def test_has_existing_failure_comment_false():
-    pr = MagicMock()
-    comment = MagicMock()
-    comment.body = "Looks good to me!"
-    pr.get_issue_comments.return_value = [comment]
+    comment = SimpleNamespace(body="Looks good to me!")
+    pr = SimpleNamespace(get_issue_comments=lambda: [comment])
     assert has_existing_failure_comment(pr) is False
 
 
 def test_has_existing_failure_comment_exception():
-    pr = MagicMock()
-    pr.get_issue_comments.side_effect = Exception("API Error")
+    pr = SimpleNamespace(get_issue_comments=_raise_api_error)
     assert has_existing_failure_comment(pr) is False
 
 
 def test_build_failure_comment():
-    pr = MagicMock()
-    pr.user.login = "testuser"
+    pr = SimpleNamespace(user=SimpleNamespace(login="testuser"))
     failed_checks = [
         {"context": "lint", "description": "Linting failed", "url": "http://lint"},
         {"context": "test", "description": "Tests failed", "url": ""},
@@ -43,91 +72,42 @@ def test_build_failure_comment():
     assert "- **test**: Tests failed" in comment
 
 
-def test_check_pipeline_status_success_no_statuses():
-    pr = MagicMock()
-    repo = pr.base.repo
-    commit = MagicMock()
-    repo.get_commit.return_value = commit
-
-    combined = MagicMock()
-    combined.state = "pending"
-    combined.total_count = 0
-    commit.get_combined_status.return_value = combined
-
-    commit.get_check_runs.return_value = []
-
-    result = check_pipeline_status(pr)
-    assert result["state"] == "success"
-    assert len(result["failed_checks"]) == 0
-
-
-def test_check_pipeline_status_failure_status():
-    pr = MagicMock()
-    repo = pr.base.repo
-    commit = MagicMock()
-    repo.get_commit.return_value = commit
-
-    combined = MagicMock()
-    combined.state = "failure"
-
-    status = MagicMock()
-    status.state = "failure"
-    status.context = "CI"
-    status.description = "CI failed"
-    status.target_url = "http://ci"
-    combined.statuses = [status]
-
-    commit.get_combined_status.return_value = combined
-    commit.get_check_runs.return_value = []
+@pytest.mark.parametrize(
+    "combined_state, statuses, expected_state, expected_contexts",
+    [
+        ("pending", [], "success", []),
+        ("failure", [make_status("failure", "CI", "CI failed", "http://ci")], "failure", ["CI"]),
+        ("failure", [make_status("failure", "CI", "Recent account payments have failed")], "success", []),
+        ("failure", [make_status("failure", "SonarCloud Quality Gate", "Gate failed")], "success", []),
+        ("pending", [make_status("pending", "CI")], "pending", []),
+    ],
+    ids=["no_statuses", "failure", "billing_failure", "ignorable_failure", "pending"],
+)
+def test_check_pipeline_status_legacy_states(combined_state, statuses, expected_state, expected_contexts):
+    pr = build_pipeline_pr(combined_state=combined_state, statuses=statuses)
 
     result = check_pipeline_status(pr)
-    assert result["state"] == "failure"
-    assert len(result["failed_checks"]) == 1
-    assert result["failed_checks"][0]["context"] == "CI"
+    assert result["state"] == expected_state
+    assert [check["context"] for check in result["failed_checks"]] == expected_contexts
 
 
 def test_check_pipeline_status_check_run_failure():
-    pr = MagicMock()
-    repo = pr.base.repo
-    commit = MagicMock()
-    repo.get_commit.return_value = commit
-
-    combined = MagicMock()
-    combined.state = "success"
-    commit.get_combined_status.return_value = combined
-
-    check_run = MagicMock()
-    check_run.conclusion = "failure"
-    check_run.name = "Tests"
-    check_run.output = {"summary": "Tests failed"}
-    check_run.html_url = "http://tests"
-
-    commit.get_check_runs.return_value = [check_run]
+    output = SimpleNamespace(title="Test Failed", summary="Tests failed")
+    check_run = make_check_run("Tests", "failure", output=output, html_url="http://tests")
+    pr = build_pipeline_pr(check_runs=[check_run])
 
     result = check_pipeline_status(pr)
     assert result["state"] == "failure"
     assert len(result["failed_checks"]) == 1
     assert result["failed_checks"][0]["context"] == "Tests"
+    assert result["failed_checks"][0]["description"] == "Tests failed"
 
 
 def test_check_pipeline_status_extracts_coverage_from_summary():
-    pr = MagicMock()
-    repo = pr.base.repo
-    commit = MagicMock()
-    repo.get_commit.return_value = commit
-
-    combined = MagicMock()
-    combined.state = "success"
-    commit.get_combined_status.return_value = combined
-
-    check_run = MagicMock()
-    check_run.conclusion = "success"
-    check_run.name = "Coverage"
-    check_run.status = "completed"
-    check_run.output = {"summary": "Coverage: 84.5%"}
-    check_run.html_url = "http://coverage"
-
-    commit.get_check_runs.return_value = [check_run]
+    check_run = make_check_run(
+        "Coverage", "success", output={"summary": "Coverage: 84.5%"}, html_url="http://coverage"
+    )
+    pr = build_pipeline_pr(check_runs=[check_run])
 
     result = check_pipeline_status(pr)
     assert result["state"] == "success"
@@ -136,20 +116,8 @@ def test_check_pipeline_status_extracts_coverage_from_summary():
 
 
 def test_check_pipeline_status_check_run_pending():
-    pr = MagicMock()
-    repo = pr.base.repo
-    commit = MagicMock()
-    repo.get_commit.return_value = commit
-
-    combined = MagicMock()
-    combined.state = "success"
-    commit.get_combined_status.return_value = combined
-
-    check_run = MagicMock()
-    check_run.conclusion = None
-    check_run.status = "in_progress"
-
-    commit.get_check_runs.return_value = [check_run]
+    check_run = make_check_run("Tests", None, status="in_progress")
+    pr = build_pipeline_pr(check_runs=[check_run])
 
     result = check_pipeline_status(pr)
     assert result["state"] == "pending"
@@ -157,8 +125,7 @@ def test_check_pipeline_status_check_run_pending():
 
 
 def test_check_pipeline_status_exception():
-    pr = MagicMock()
-    pr.base.repo.get_commit.side_effect = Exception("API Error")
+    pr = make_pr_for_repo(SimpleNamespace(get_commit=_raise_api_error))
 
     result = check_pipeline_status(pr)
     assert result["state"] == "unknown"
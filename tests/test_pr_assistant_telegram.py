@@ -1,34 +1,39 @@
 from unittest.mock import MagicMock
 
+import pytest
+
 from src.agents.pr_assistant.telegram_summary import build_and_send_summary
+from src.notifications.telegram import TelegramNotifier
+from tests.helpers import make_result
+
+MERGED_11 = [make_result(i) for i in range(1, 12)]
+SKIPPED_7 = [make_result(i, reason="reason1") for i in range(1, 7)] + [
+    make_result(7, reason="reason2")
+]
+
+
+@pytest.fixture(scope="module")
+def module_telegram():
+    """One spec'd notifier per module; ``escape_html`` passes text through unchanged."""
+    telegram = MagicMock(spec=TelegramNotifier)
+    telegram.escape_html = lambda x: x
+    return telegram
+
 
+@pytest.fixture
+def telegram(module_telegram):
+    module_telegram.reset_mock()
+    return module_telegram
 
-def test_build_and_send_summary_empty():
-    telegram = MagicMock()
+
+def test_build_and_send_summary_empty(telegram):
     results = {}
     build_and_send_summary(results, telegram, "test_owner")
     telegram.send_message.assert_not_called()
 
 
-def test_build_and_send_summary_merged():
-    telegram = MagicMock()
-    telegram.escape_html = lambda x: x
-
-    results = {
-        "merged": [
-            {"repository": "repo1", "pr": 1, "title": "PR 1"},
-            {"repository": "repo2", "pr": 2, "title": "PR 2"},
-            {"repository": "repo3", "pr": 3, "title": "PR 3"},
-            {"repository": "repo4", "pr": 4, "title": "PR 4"},
-            {"repository": "repo5", "pr": 5, "title": "PR 5"},
-            {"repository": "repo6", "pr": 6, "title": "PR 6"},
-            {"repository": "repo7", "pr": 7, "title": "PR 7"},
-            {"repository": "repo8", "pr": 8, "title": "PR 8"},
-            {"repository": "repo9", "pr": 9, "title": "PR 9"},
-            {"repository": "repo10", "pr": 10, "title": "PR 10"},
-            {"repository": "repo11", "pr": 11, "title": "PR 11"},
-        ]
-    }
+def test_build_and_send_summary_merged(telegram):
+    results = {"merged": MERGED_11}
 
     build_and_send_summary(results, telegram, "test_owner")
     telegram.send_message.assert_called_once()
@@ -40,15 +45,8 @@ def test_build_and_send_summary_merged():
     assert "+ 1 outros..." in msg
 
 
-def test_build_and_send_summary_conflicts():
-    telegram = MagicMock()
-    telegram.escape_html = lambda x: x
-
-    results = {
-        "conflicts_resolved": [
-            {"repository": "repo1", "pr": 1, "title": "PR 1"},
-        ]
-    }
+def test_build_and_send_summary_conflicts(telegram):
+    results = {"conflicts_resolved": [make_result(1)]}
 
     build_and_send_summary(results, telegram, "test_owner")
     telegram.send_message.assert_called_once()
@@ -58,15 +56,8 @@ def test_build_and_send_summary_conflicts():
     assert "repo1" in msg
 
 
-def test_build_and_send_summary_pipeline_failures():
-    telegram = MagicMock()
-    telegram.escape_html = lambda x: x
-
-    results = {
-        "pipeline_failures": [
-            {"repository": "repo1", "pr": 1, "title": "PR 1", "state": "failure"},
-        ]
-    }
+def test_build_and_send_summary_pipeline_failures(telegram):
+    results = {"pipeline_failures": [make_result(1, state="failure")]}
 
     build_and_send_summary(results, telegram, "test_owner")
     telegram.send_message.assert_called_once()
@@ -77,21 +68,8 @@ def test_build_and_send_summary_pipeline_failures():
     assert "failure" in msg
 
 
-def test_build_and_send_summary_skipped():
-    telegram = MagicMock()
-    telegram.escape_html = lambda x: x
-
-    results = {
-        "skipped": [
-            {"repository": "repo1", "pr": 1, "title": "PR 1", "reason": "reason1"},
-            {"repository": "repo2", "pr": 2, "title": "PR 2", "reason": "reason1"},
-            {"repository": "repo3", "pr": 3, "title": "PR 3", "reason": "reason1"},
-            {"repository": "repo4", "pr": 4, "title": "PR 4", "reason": "reason1"},
-            {"repository": "repo5", "pr": 5, "title": "PR 5", "reason": "reason1"},
-            {"repository": "repo6", "pr": 6, "title": "PR 6", "reason": "reason1"},
-            {"repository": "repo7", "pr": 7, "title": "PR 7", "reason": "reason2"},
-        ]
-    }
+def test_build_and_send_summary_skipped(telegram):
+    results = {"skipped": SKIPPED_7}
 
     build_and_send_summary(results, telegram, "test_owner")
     telegram.send_message.assert_called_once()
@@ -6,15 +6,11 @@ from src.agents.product_manager.agent import ProductManagerAgent
 
 class TestProductManagerAgent(unittest.TestCase):
     def setUp(self):
-        self._get_ai_client_patcher = patch("src.agents.product_manager.agent.get_ai_client", return_value=None)
-        self._get_ai_client_patcher.start()
         self.mock_jules = MagicMock()
         self.mock_github = MagicMock()
         self.mock_allowlist = MagicMock()
-        self.agent = ProductManagerAgent(self.mock_jules, self.mock_github, self.mock_allowlist)
-
-    def tearDown(self):
-        self._get_ai_client_patcher.stop()
+        with patch("src.agents.product_manager.agent.get_ai_client", return_value=None):
+            self.agent = ProductManagerAgent(self.mock_jules, self.mock_github, self.mock_allowlist)
 
     def test_run_empty_allowlist(self):
         self.mock_allowlist.list_repositories.return_value = []
@@ -1,4 +1,6 @@
 import json
+import os
+import tempfile
 import unittest
 from unittest.mock import mock_open, patch
 
@@ -7,7 +9,9 @@ from src.config.repository_allowlist import RepositoryAllowlist
 
 class TestRepositoryAllowlist(unittest.TestCase):
     def setUp(self):
-        self.allowlist_path = "config/repositories.json"
+        # Point at a scratch dir so a missed patch can never touch the real config/ file.
+        tmpdir = self.enterContext(tempfile.TemporaryDirectory())
+        self.allowlist_path = os.path.join(tmpdir, "repositories.json")
 
     def test_load_success(self):
         data = {"repositories": ["repo1", "repo2"]}
@@ -1,180 +1,186 @@
+import json
 import sys
 import unittest
-from unittest.mock import MagicMock, patch
-
+from dataclasses import fields
+from types import SimpleNamespace
+from unittest.mock import DEFAULT, MagicMock, patch
+
+import pytest
+
+import src.run_agent as run_agent_module
+from src.agents.base_agent import BaseAgent
+from src.config.repository_allowlist import RepositoryAllowlist
+from src.config.settings import Settings
+from src.github_client import GithubClient
+from src.jules.client import JulesClient
 from src.notifications.telegram import TelegramNotifier
-from src.run_agent import main, save_results, send_execution_report
+from src.run_agent import (
+    _build_ai_config,
+    _create_agent,
+    _create_base_deps,
+    main,
+    run_all,
+    save_results,
+    send_execution_report,
+)
 
+_ENABLE_FLAGS = tuple(
+    f.name for f in fields(Settings) if f.name.startswith("enable_") and f.name != "enable_ai"
+)
+
+# Agents run_all starts regardless of their enable_* flag.
+ALWAYS_RUN_AGENTS = ("conflict-resolver", "code-reviewer")
 
-class TestRunAgentCoverage(unittest.TestCase):
-    @patch("sys.exit")
-    def test_main_no_args(self, mock_exit):
-        mock_exit.side_effect = SystemExit(2)
-        with patch.object(sys, 'argv', ['run-agent']):
-            with self.assertRaises(SystemExit):
-                main()
-            mock_exit.assert_called_with(2)
-
-    @patch("sys.exit")
-    def test_main_unknown_agent(self, mock_exit):
-        mock_exit.side_effect = SystemExit(2)
-        with patch.object(sys, 'argv', ['run-agent', 'unknown']):
-            with self.assertRaises(SystemExit):
-                main()
-            mock_exit.assert_called_with(2)
-
-    @patch("src.run_agent.send_execution_report")
-    @patch("src.run_agent._create_base_deps")
-    @patch("src.run_agent.run_all")
-    @patch("src.run_agent.Settings")
-    def test_main_all_agents(self, mock_settings, mock_run_all, mock_deps, mock_report):
-        mock_settings.from_env.return_value = MagicMock()
-        mock_run_all.return_value = {"status": "ok"}
-        mock_deps.return_value = {"telegram": MagicMock()}
-        with patch.object(sys, 'argv', ['run-agent', 'all']):
-            main()
-        mock_run_all.assert_called_once()
-
-    @patch("src.run_agent.send_execution_report")
-    @patch("src.run_agent._create_base_deps")
-    @patch("src.run_agent._create_agent")
-    @patch("src.run_agent.Settings")
-    def test_main_specific_agent(self, mock_settings, mock_create, mock_deps, mock_report):
-        mock_settings.from_env.return_value = MagicMock()
-        mock_agent = MagicMock()
-        mock_agent.run.return_value = {"status": "success"}
-        mock_create.return_value = mock_agent
-        mock_deps.return_value = {"telegram": MagicMock()}
-        with patch.object(sys, 'argv', ['run-agent', 'pr-assistant']):
-            main()
-        mock_create.assert_called_once()
-
-    @patch("src.run_agent.send_execution_report")
-    @patch("src.run_agent._create_base_deps")
-    @patch("src.run_agent._create_agent")
-    @patch("src.run_agent.Settings")
-    def test_main_specific_agent_with_args(self, mock_settings, mock_create, mock_deps, mock_report):
-        mock_settings.from_env.return_value = MagicMock()
-        mock_agent = MagicMock()
-        mock_agent.run.return_value = {"status": "success"}
-        mock_create.return_value = mock_agent
-        mock_deps.return_value = {"telegram": MagicMock()}
-        with patch.object(sys, 'argv', ['run-agent', 'pr-assistant', '--ai-provider', 'ollama', '--ai-model', 'llama3']):
-            main()
-        mock_create.assert_called_once()
-
-    @patch("src.run_agent.send_execution_report")
-    @patch("src.run_agent._create_base_deps")
-    @patch("src.run_agent._create_agent")
-    @patch("src.run_agent.Settings")
-    def test_main_specific_agent_with_provider_only(self, mock_settings, mock_create, mock_deps, mock_report):
-        mock_settings_instance = MagicMock()
-        mock_settings_instance.ai_provider = "gemini"
-        mock_settings_instance.ai_model = "gemini-2.5-flash"
-        mock_settings.from_env.return_value = mock_settings_instance
-
-        mock_agent = MagicMock()
-        mock_agent.run.return_value = {"status": "success"}
-        mock_create.return_value = mock_agent
-        mock_deps.return_value = {"telegram": MagicMock()}
-        with patch.object(sys, 'argv', ['run-agent', 'pr-assistant', '--ai-provider', 'ollama']):
-            main()
-        mock_create.assert_called_once()
-
-    @patch("src.run_agent.send_execution_report")
-    @patch("src.run_agent._create_base_deps")
-    @patch("src.run_agent._create_agent")
-    @patch("src.run_agent.Settings")
-    def test_main_specific_agent_with_openai_provider_only(self, mock_settings, mock_create, mock_deps, mock_report):
-        mock_settings_instance = MagicMock()
-        mock_settings_instance.ai_provider = "gemini"
-        mock_settings_instance.ai_model = "gemini-2.5-flash"
-        mock_settings.from_env.return_value = mock_settings_instance
-
-        mock_agent = MagicMock()
-        mock_agent.run.return_value = {"status": "success"}
-        mock_create.return_value = mock_agent
-        mock_deps.return_value = {"telegram": MagicMock()}
-        with patch.object(sys, 'argv', ['run-agent', 'pr-assistant', '--ai-provider', 'openai']):
-            main()
-        mock_create.assert_called_once()
-
-    @patch("src.run_agent.send_execution_report")
-    @patch("src.run_agent._create_base_deps")
-    @patch("src.run_agent.run_all")
-    @patch("src.run_agent.Settings")
-    def test_main_all_agents_with_args(self, mock_settings, mock_run_all, mock_deps, mock_report):
-        mock_settings_instance = MagicMock()
-        mock_settings_instance.enable_ai = True
-        mock_settings.from_env.return_value = mock_settings_instance
-        mock_run_all.return_value = {"status": "ok"}
-        mock_deps.return_value = {"telegram": MagicMock()}
-        with patch.object(sys, 'argv', ['run-agent', 'all', '--ai-provider', 'openai']):
-            main()
-        mock_run_all.assert_called_once()
 
+def make_settings(*enabled, enable_ai=True):
+    """Settings stand-in for run_all with only the named ``enable_*`` flags switched on."""
+    flags = dict.fromkeys(_ENABLE_FLAGS, False)
+    flags.update(dict.fromkeys(enabled, True))
+    return SimpleNamespace(enable_ai=enable_ai, **flags)
+
+
+def make_base_deps():
+    """Spec'd stand-ins for the dependencies returned by ``_create_base_deps``."""
+    return {
+        "github_client": MagicMock(spec=GithubClient),
+        "jules_client": MagicMock(spec=JulesClient),
+        "allowlist": MagicMock(spec=RepositoryAllowlist),
+        "telegram": MagicMock(spec=TelegramNotifier),
+    }
+
+
+# Everything main() touches besides argument parsing and health checks.
+MAIN_TARGETS = (
+    "Settings", "_create_agent", "_create_base_deps", "send_execution_report", "run_all", "save_results",
+)
+
+
+@pytest.fixture(scope="module")
+def _run_agent_mock_pool():
+    """MagicMocks for MAIN_TARGETS plus the agent double, built once per module."""
+    return {name: MagicMock() for name in MAIN_TARGETS}, MagicMock(spec=BaseAgent)
+
+
+@pytest.fixture
+def run_agent_mocks(monkeypatch, _run_agent_mock_pool):
+    """Replace every MAIN_TARGETS attribute of src.run_agent with a pooled mock, keyed by name."""
+    mocks, agent = _run_agent_mock_pool
+    for mock in (*mocks.values(), agent):
+        mock.reset_mock(return_value=True, side_effect=True)
+    agent.run.return_value = {"status": "success"}
+    mocks["_create_agent"].return_value = agent
+    mocks["run_all"].return_value = {"status": "success"}
+    for name, mock in mocks.items():
+        monkeypatch.setattr(run_agent_module, name, mock)
+    return mocks
+
+
+@pytest.mark.parametrize(
+    "agent_name", ["pr-assistant", "product-manager", "interface-developer", "senior-developer"]
+)
+def test_run_specific_agent(cli, run_agent_mocks, agent_name):
+    cli(agent_name)
+    main()
+
+    run_agent_mocks["_create_agent"].assert_called_once()
+    assert run_agent_mocks["_create_agent"].call_args.args[0] == agent_name
+
+
+def test_run_all(cli, run_agent_mocks):
+    cli("all")
+    main()
+
+    run_agent_mocks["run_all"].assert_called_once()
+
+
+@pytest.mark.parametrize("args", [(), ("unknown",)], ids=["no_args", "unknown_agent"])
+def test_main_rejects_bad_arguments(cli, monkeypatch, args):
+    exit_mock = MagicMock(side_effect=SystemExit(2))
+    monkeypatch.setattr(sys, "exit", exit_mock)
+    cli(*args)
+
+    with pytest.raises(SystemExit):
+        main()
+    exit_mock.assert_called_with(2)
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ("--ai-provider", "ollama", "--ai-model", "llama3"),
+        ("--ai-provider", "ollama"),
+        ("--ai-provider", "openai"),
+    ],
+    ids=["with_args", "with_provider_only", "with_openai_provider_only"],
+)
+def test_main_specific_agent_provider_args(cli, run_agent_mocks, args):
+    settings = run_agent_mocks["Settings"].from_env.return_value
+    settings.ai_provider = "gemini"
+    settings.ai_model = "gemini-2.5-flash"
+    cli("pr-assistant", *args)
+
+    main()
+
+    run_agent_mocks["_create_agent"].assert_called_once()
+
+
+def test_main_all_agents_with_args(cli, run_agent_mocks):
+    run_agent_mocks["Settings"].from_env.return_value.enable_ai = True
+    run_agent_mocks["run_all"].return_value = {"status": "ok"}
+    cli("all", "--ai-provider", "openai")
+
+    main()
+
+    run_agent_mocks["run_all"].assert_called_once()
+
+
+@pytest.mark.slow
+def test_main_agent_exception(cli, run_agent_mocks):
+    run_agent_mocks["_create_agent"].side_effect = Exception("Fatal")
+    cli("pr-assistant")
+
+    with pytest.raises(SystemExit):
+        main()
+
+
+def test_save_results(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    save_results("test-agent", {"status": "ok"})
+
+    [out_file] = (tmp_path / "results").glob("test-agent_*.json")
+    assert json.loads(out_file.read_text(encoding="utf-8")) == {"status": "ok"}
+
+
+class TestRunAgentCoverage(unittest.TestCase):
     @patch("src.run_agent.run_agent")
     def test_run_all_skips_disabled_agents(self, mock_run_agent):
-        settings = MagicMock()
-        settings.enable_product_manager = False
-        settings.enable_interface_developer = False
-        settings.enable_senior_developer = False
-        settings.enable_pr_assistant = False
-        settings.enable_security_scanner = False
-        settings.enable_ci_health = False
-        settings.enable_release_watcher = False
-        settings.enable_dependency_risk = False
-        settings.enable_pr_sla = False
-        settings.enable_issue_escalation = False
-        settings.enable_jules_tracker = False
-        settings.enable_secret_remover = False
-        settings.enable_project_creator = False
-        settings.enable_ai = True
+        settings = make_settings()
 
-        from src.run_agent import run_all
         run_all(settings)
-        self.assertEqual(mock_run_agent.call_count, 2)
+        called = [c.args[0] for c in mock_run_agent.call_args_list]
+        self.assertEqual(called, list(ALWAYS_RUN_AGENTS))
 
     @patch("src.run_agent.run_agent")
     def test_run_all_skips_ai_agents_if_ai_disabled(self, mock_run_agent):
-        settings = MagicMock()
-        settings.enable_product_manager = True
-        settings.enable_interface_developer = True
-        settings.enable_senior_developer = True
-        settings.enable_pr_assistant = True
-        settings.enable_security_scanner = False
-        settings.enable_ci_health = False
-        settings.enable_release_watcher = False
-        settings.enable_dependency_risk = False
-        settings.enable_pr_sla = False
-        settings.enable_issue_escalation = False
-        settings.enable_jules_tracker = True
-        settings.enable_secret_remover = True
-        settings.enable_ai = False
+        settings = make_settings(
+            "enable_product_manager",
+            "enable_interface_developer",
+            "enable_senior_developer",
+            "enable_pr_assistant",
+            "enable_jules_tracker",
+            "enable_secret_remover",
+            enable_ai=False,
+        )
 
-        from src.run_agent import run_all
         run_all(settings)
         mock_run_agent.assert_not_called()
 
     @patch("src.run_agent.run_agent")
     def test_run_all_catches_agent_exception(self, mock_run_agent):
-        settings = MagicMock()
-        settings.enable_product_manager = True
-        settings.enable_interface_developer = False
-        settings.enable_senior_developer = False
-        settings.enable_pr_assistant = False
-        settings.enable_security_scanner = False
-        settings.enable_ci_health = False
-        settings.enable_release_watcher = False
-        settings.enable_dependency_risk = False
-        settings.enable_pr_sla = False
-        settings.enable_issue_escalation = False
-        settings.enable_jules_tracker = False
-        settings.enable_secret_remover = False
-        settings.enable_ai = True
+        settings = make_settings("enable_product_manager")
 
         mock_run_agent.side_effect = Exception("Test error")
-        from src.run_agent import run_all
         results = run_all(settings)
 
         self.assertIn("product-manager", results)
@@ -185,14 +191,8 @@ class TestRunAgentCoverage(unittest.TestCase):
         settings.enable_ai = False
         settings.github_owner = "test"
 
-        from src.run_agent import _create_agent
         with patch("src.run_agent._create_base_deps") as mock_deps:
-            mock_deps.return_value = {
-                "github_client": MagicMock(),
-                "jules_client": MagicMock(),
-                "allowlist": MagicMock(),
-                "telegram": MagicMock()
-            }
+            mock_deps.return_value = make_base_deps()
             with self.assertRaises(PermissionError):
                 _create_agent("pr-assistant", settings)
 
@@ -204,22 +204,23 @@ class TestRunAgentCoverage(unittest.TestCase):
         settings.telegram_bot_token = "bot"
         settings.telegram_chat_id = "chat"
 
-        from src.run_agent import _create_base_deps
-        with patch("src.run_agent.GithubClient") as mock_gh, \
-             patch("src.run_agent.JulesClient") as mock_jc, \
-             patch("src.run_agent.RepositoryAllowlist") as mock_ra, \
-             patch("src.run_agent.TelegramNotifier") as mock_tn:
-
+        with patch.multiple(
+            "src.run_agent",
+            GithubClient=DEFAULT,
+            JulesClient=DEFAULT,
+            RepositoryAllowlist=DEFAULT,
+            TelegramNotifier=DEFAULT,
+        ) as mocks:
             deps = _create_base_deps(settings)
 
             self.assertIn("github_client", deps)
             self.assertIn("jules_client", deps)
             self.assertIn("allowlist", deps)
             self.assertIn("telegram", deps)
-            mock_gh.assert_called_once_with("token")
-            mock_jc.assert_called_once_with("key")
-            mock_ra.assert_called_once_with("path")
-            mock_tn.assert_called_once_with(bot_token="bot", chat_id="chat")
+            mocks["GithubClient"].assert_called_once_with("token")
+            mocks["JulesClient"].assert_called_once_with("key")
+            mocks["RepositoryAllowlist"].assert_called_once_with("path")
+            mocks["TelegramNotifier"].assert_called_once_with(bot_token="bot", chat_id="chat")
 
     def test_build_ai_config(self):
         settings = MagicMock()
@@ -229,7 +230,6 @@ class TestRunAgentCoverage(unittest.TestCase):
         settings.gemini_api_key = "gemini-key"
         settings.openai_api_key = "openai-key"
 
-        from src.run_agent import _build_ai_config
 
         # Test ollama from settings
         config = _build_ai_config(settings)
@@ -259,17 +259,11 @@ class TestRunAgentCoverage(unittest.TestCase):
         settings.enable_ai = True
         settings.github_owner = "test"
 
-        from src.run_agent import _create_agent
         with patch("src.run_agent._create_base_deps") as mock_deps, \
              patch("src.run_agent._build_ai_config") as mock_config, \
              patch("src.run_agent.AGENT_REGISTRY") as mock_registry:
 
-            mock_deps.return_value = {
-                "github_client": MagicMock(),
-                "jules_client": MagicMock(),
-                "allowlist": MagicMock(),
-                "telegram": MagicMock()
-            }
+            mock_deps.return_value = make_base_deps()
             mock_config.return_value = {"ai_provider": "test", "ai_model": "test", "ai_config": {}}
 
             mock_agent_cls = MagicMock()
@@ -281,25 +275,6 @@ class TestRunAgentCoverage(unittest.TestCase):
             kwargs = mock_agent_cls.call_args[1]
             self.assertEqual(kwargs["pr_ref"], "owner/repo#123")
 
-    @patch("src.run_agent.send_execution_report")
-    @patch("src.run_agent._create_base_deps")
-    @patch("src.run_agent._create_agent")
-    @patch("src.run_agent.Settings")
-    def test_main_agent_exception(self, mock_settings, mock_create, mock_deps, mock_report):
-        mock_settings.from_env.return_value = MagicMock()
-        mock_create.side_effect = Exception("Fatal")
-        mock_deps.return_value = {"telegram": MagicMock()}
-        with patch.object(sys, 'argv', ['run-agent', 'pr-assistant']):
-            with self.assertRaises(SystemExit):
-                main()
-
-    @patch("os.makedirs")
-    @patch("builtins.open", new_callable=MagicMock)
-    def test_save_results(self, mock_open, mock_makedirs):
-        save_results("test-agent", {"status": "ok"})
-        mock_makedirs.assert_called_once()
-        mock_open.assert_called_once()
-
     def test_send_execution_report(self):
         telegram = MagicMock(spec=TelegramNotifier)
         telegram.escape = TelegramNotifier.escape
@@ -313,7 +288,6 @@ class TestRunAgentCoverage(unittest.TestCase):
         telegram.send_message.assert_called_once()
 
     def test_send_execution_report_all(self):
-        from src.run_agent import send_execution_report
         telegram = MagicMock()
         telegram.escape = lambda x: x
         results = {
@@ -328,7 +302,6 @@ class TestRunAgentCoverage(unittest.TestCase):
         self.assertIn("Error: `failed_run`", msg)
 
     def test_send_execution_report_single_error(self):
-        from src.run_agent import send_execution_report
         telegram = MagicMock()
         telegram.escape = lambda x: x
         results = {"error": "critical_error"}
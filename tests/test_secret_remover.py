@@ -1,20 +1,13 @@
 """Tests for the Secret Remover Agent."""
-import os
-import subprocess
 import tempfile
 import unittest
 from pathlib import Path
-from unittest.mock import MagicMock, mock_open, patch
+from unittest.mock import MagicMock, patch
 
 from src.agents.secret_remover.agent import SecretRemoverAgent
 from src.agents.secret_remover.ai_analyzer import analyze_finding
 from src.agents.secret_remover.processor import FindingProcessor
 from src.agents.secret_remover import git_utils, utils
-from src.agents.secret_remover.telegram_summary import (
-    build_finding_message,
-    get_finding_buttons,
-    send_finding_notification,
-)
 
 
 class TestAnalyzeFinding(unittest.TestCase):
@@ -49,6 +42,12 @@ class TestUrlBuilders(unittest.TestCase):
         url = utils.build_file_line_url("owner/repo", "abc123", "src/main.py", 42)
         self.assertEqual(url, "https://github.com/owner/repo/blob/abc123/src/main.py#L42")
 
+    def test_build_file_line_url_encodes_path(self):
+        url = utils.build_file_line_url("owner/repo", "abc123", "path/with spaces/config file.py", 1)
+        self.assertEqual(
+            url, "https://github.com/owner/repo/blob/abc123/path/with%20spaces/config%20file.py#L1"
+        )
+
     def test_build_repo_url(self):
         url = utils.build_repo_url("owner/repo")
         self.assertEqual(url, "https://github.com/owner/repo")
@@ -1,48 +1,84 @@
 
 import unittest
-from unittest.mock import MagicMock
+from types import SimpleNamespace
 
 from src.agents.security_scanner import telegram_summary
-from src.agents.security_scanner.telegram_summary import _send_lines, _send_repo_block
+from src.agents.security_scanner.telegram_summary import (
+    _iter_message_chunks,
+    _send_lines,
+    _send_repo_block,
+)
+
+
+def _fake_telegram(truncate=lambda x: x):
+    """Telegram double that records each sent text in ``sent`` (no MagicMock bookkeeping)."""
+    sent: list[str] = []
+    return SimpleNamespace(
+        sent=sent,
+        send_message=lambda text, **kwargs: sent.append(text),
+        escape=lambda x: x,
+        _truncate=truncate,
+    )
 
 
 class TestTelegramSummaryCoverage(unittest.TestCase):
     def test_telegram_summary_send_lines_truncate(self):
-        telegram = MagicMock()
-        telegram._truncate = lambda x: x[:10]
+        telegram = _fake_telegram(truncate=lambda x: x[:10])
         old_max = telegram_summary._MAX_LEN
         telegram_summary._MAX_LEN = 10
         _send_lines(["A"*15], telegram)
-        telegram.send_message.assert_called_once()
-        self.assertEqual(len(telegram.send_message.call_args[0][0]), 10)
+        self.assertEqual(len(telegram.sent), 1)
+        self.assertEqual(len(telegram.sent[0]), 10)
         telegram_summary._MAX_LEN = old_max
 
     def test_telegram_summary_send_lines_split_append(self):
-        telegram = MagicMock()
-        telegram._truncate = lambda x: x
+        telegram = _fake_telegram()
         old_max = telegram_summary._MAX_LEN
         telegram_summary._MAX_LEN = 10
         _send_lines(["A"*5, "B"*6], telegram)
-        self.assertEqual(telegram.send_message.call_count, 2)
+        self.assertEqual(len(telegram.sent), 2)
         telegram_summary._MAX_LEN = old_max
 
     def test_telegram_summary_send_repo_block_truncate_full(self):
-        telegram = MagicMock()
-        telegram.escape = lambda x: x
-        telegram._truncate = lambda x: x[:10]
+        telegram = _fake_telegram(truncate=lambda x: x[:10])
         old_max = telegram_summary._MAX_LEN
         telegram_summary._MAX_LEN = 10
         finding = {"rule_id": "rule1", "file": "file1", "line": 1, "full_commit": "commit1"}
         _send_repo_block("owner/repo", [finding], telegram, telegram.escape, lambda r, c: "author")
-        telegram.send_message.assert_called_once()
-        self.assertEqual(len(telegram.send_message.call_args[0][0]), 10)
+        self.assertEqual(len(telegram.sent), 1)
+        self.assertEqual(len(telegram.sent[0]), 10)
         telegram_summary._MAX_LEN = old_max
 
     def test_send_repo_block_unknown_author(self):
-        telegram = MagicMock()
-        telegram.escape = lambda x: x
-        telegram._truncate = lambda x: x
+        telegram = _fake_telegram()
         finding = {"rule_id": "r", "file": "f", "line": 1, "full_commit": "c"}
         _send_repo_block("repo", [finding], telegram, telegram.escape, lambda r, c: "unknown")
-        telegram.send_message.assert_called_once()
-        self.assertIn("unknown", telegram.send_message.call_args[0][0])
+        self.assertEqual(len(telegram.sent), 1)
+        self.assertIn("unknown", telegram.sent[0])
+
+    def test_send_lines_joins_and_continues(self):
+        telegram = _fake_telegram()
+        lines = ["x" * 1500, "y" * 1500, "z" * 1500]
+        _send_lines(lines, telegram)
+        self.assertEqual(telegram.sent, [
+            "\n".join(lines[:2]),
+            telegram_summary._CONTINUATION_HEADER + "\n" + lines[2],
+        ])
+
+    def test_iter_message_chunks_stay_within_limit(self):
+        telegram = _fake_telegram()
+        lines = (f"line {i} " + "x" * 200 for i in range(100))
+        chunks = list(_iter_message_chunks(lines, telegram))
+        self.assertGreater(len(chunks), 1)
+        for chunk in chunks:
+            self.assertLessEqual(len(chunk), telegram_summary._MAX_LEN)
+        self.assertTrue(all(c.startswith(telegram_summary._CONTINUATION_HEADER) for c in chunks[1:]))
+
+    def test_send_repo_block_encodes_special_chars_in_path(self):
+        telegram = _fake_telegram()
+        finding = {"rule_id": "r", "file": "path/with spaces/config file.py", "line": 7, "full_commit": "c"}
+        _send_repo_block("owner/repo", [finding], telegram, telegram.escape, lambda r, c: "unknown")
+        self.assertIn(
+            "https://github.com/owner/repo/blob/c/path/with%20spaces/config%20file.py#L7",
+            telegram.sent[0],
+        )
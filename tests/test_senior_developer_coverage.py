@@ -1,6 +1,8 @@
 import unittest
 from unittest.mock import MagicMock, patch
 
+from github.Repository import Repository
+
 from src.agents.senior_developer.agent import SeniorDeveloperAgent
 
 
@@ -14,7 +16,7 @@ class TestSeniorDeveloperCoverage(unittest.TestCase):
 
     @patch.object(SeniorDeveloperAgent, 'get_repository_info')
     def test_analyze_security(self, mock_get_repo):
-        repo = MagicMock()
+        repo = MagicMock(spec=Repository)
         mock_get_repo.return_value = repo
 
         # Missing .gitignore
@@ -26,7 +28,7 @@ class TestSeniorDeveloperCoverage(unittest.TestCase):
 
     @patch.object(SeniorDeveloperAgent, 'get_repository_info')
     def test_analyze_security_clean(self, mock_get_repo):
-        repo = MagicMock()
+        repo = MagicMock(spec=Repository)
         mock_get_repo.return_value = repo
 
         # .gitignore present with .env
@@ -49,7 +51,7 @@ class TestSeniorDeveloperCoverage(unittest.TestCase):
 
     @patch.object(SeniorDeveloperAgent, 'get_repository_info')
     def test_analyze_cicd(self, mock_get_repo):
-        repo = MagicMock()
+        repo = MagicMock(spec=Repository)
         mock_get_repo.return_value = repo
 
         # No workflows, no tests
@@ -61,7 +63,7 @@ class TestSeniorDeveloperCoverage(unittest.TestCase):
 
     @patch.object(SeniorDeveloperAgent, 'get_repository_info')
     def test_analyze_cicd_clean(self, mock_get_repo):
-        repo = MagicMock()
+        repo = MagicMock(spec=Repository)
         mock_get_repo.return_value = repo
 
         item_test = MagicMock()
@@ -81,7 +83,7 @@ class TestSeniorDeveloperCoverage(unittest.TestCase):
 
     @patch.object(SeniorDeveloperAgent, 'get_repository_info')
     def test_analyze_roadmap_features(self, mock_get_repo):
-        repo = MagicMock()
+        repo = MagicMock(spec=Repository)
         mock_get_repo.return_value = repo
 
         # ROADMAP.md exists
@@ -103,7 +105,7 @@ class TestSeniorDeveloperCoverage(unittest.TestCase):
 
     @patch.object(SeniorDeveloperAgent, 'get_repository_info')
     def test_analyze_roadmap_features_none(self, mock_get_repo):
-        repo = MagicMock()
+        repo = MagicMock(spec=Repository)
         mock_get_repo.return_value = repo
 
         repo.get_contents.side_effect = Exception("Not found")
@@ -134,7 +136,7 @@ class TestSeniorDeveloperCoverage(unittest.TestCase):
 
     @patch.object(SeniorDeveloperAgent, 'get_repository_info')
     def test_analyze_tech_debt_exception(self, mock_get_repo):
-        repo = MagicMock()
+        repo = MagicMock(spec=Repository)
         mock_get_repo.return_value = repo
         repo.get_git_tree.side_effect = Exception("Error")
 
@@ -143,7 +145,7 @@ class TestSeniorDeveloperCoverage(unittest.TestCase):
 
     @patch.object(SeniorDeveloperAgent, 'get_repository_info')
     def test_analyze_modernization_exception(self, mock_get_repo):
-        repo = MagicMock()
+        repo = MagicMock(spec=Repository)
         mock_get_repo.return_value = repo
         repo.get_git_tree.side_effect = Exception("Error")
 
@@ -152,7 +154,7 @@ class TestSeniorDeveloperCoverage(unittest.TestCase):
 
     @patch.object(SeniorDeveloperAgent, 'get_repository_info')
     def test_analyze_performance_exception(self, mock_get_repo):
-        repo = MagicMock()
+        repo = MagicMock(spec=Repository)
         mock_get_repo.return_value = repo
         repo.get_contents.side_effect = Exception("Error")
         repo.get_git_tree.side_effect = Exception("Error")
@@ -1,9 +1,14 @@
 
 import unittest
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
+from github.Repository import Repository
+
 from src.agents.senior_developer.agent import SeniorDeveloperAgent
-from src.agents.senior_developer.analyzers import SeniorDeveloperAnalyzer
+
+# Just over the analyzer's 200-file "large codebase" threshold; read-only, so built once.
+_LARGE_TREE = tuple(SimpleNamespace(path=f"src/file_{i}.py", size=100) for i in range(201))
 
 
 class TestSeniorDeveloperEdgeCasesCoverage(unittest.TestCase):
@@ -105,7 +110,7 @@ class TestSeniorDeveloperEdgeCasesCoverage(unittest.TestCase):
 
     @patch("src.agents.senior_developer.agent.datetime")
     def test_count_today_sessions_utc_minus_3_success(self, mock_datetime):
-        from datetime import UTC, datetime, timedelta
+        from datetime import UTC, datetime
 
         # Use a fixed time to prevent flaky tests due to race conditions around midnight.
         fixed_now = datetime(2024, 1, 1, 2, 0, 0, tzinfo=UTC)
@@ -137,14 +142,14 @@ class TestSeniorDeveloperEdgeCasesCoverage(unittest.TestCase):
 
     def test_analyzer_analyze_security_issues_none(self):
         from github.GithubException import UnknownObjectException
-        mock_repo = MagicMock()
+        mock_repo = MagicMock(spec=Repository)
         mock_repo.get_contents.side_effect = UnknownObjectException(404, "Not found")
         self.agent.get_repository_info = MagicMock(return_value=mock_repo)
         result = self.agent.analyzer.analyze_security("repo")
         self.assertTrue(result["needs_attention"])
 
     def test_analyzer_analyze_security_unexpected_exception(self):
-        mock_repo = MagicMock()
+        mock_repo = MagicMock(spec=Repository)
         def mock_get_contents(path):
             if path == ".gitignore": return MagicMock(decoded_content=b"")
             raise Exception("API Error")
@@ -154,7 +159,7 @@ class TestSeniorDeveloperEdgeCasesCoverage(unittest.TestCase):
         self.assertTrue(result["needs_attention"])
 
     def test_analyzer_analyze_cicd_unexpected_exception(self):
-        mock_repo = MagicMock()
+        mock_repo = MagicMock(spec=Repository)
         def mock_get_contents(path):
             if path == ".github/workflows": return "exists"
             raise Exception("API Error")
@@ -164,14 +169,14 @@ class TestSeniorDeveloperEdgeCasesCoverage(unittest.TestCase):
         self.assertFalse(result["needs_improvement"])
 
     def test_analyzer_analyze_roadmap_unexpected_exception(self):
-        mock_repo = MagicMock()
+        mock_repo = MagicMock(spec=Repository)
         mock_repo.get_contents.side_effect = Exception("API Error")
         self.agent.get_repository_info = MagicMock(return_value=mock_repo)
         result = self.agent.analyzer.analyze_roadmap_features("repo")
         self.assertFalse(result["has_features"])
 
     def test_analyzer_analyze_tech_debt_unexpected_exception(self):
-        mock_repo = MagicMock()
+        mock_repo = MagicMock(spec=Repository)
         mock_repo.default_branch = "main"
         mock_repo.get_git_tree.side_effect = Exception("API Error")
         self.agent.get_repository_info = MagicMock(return_value=mock_repo)
@@ -179,7 +184,7 @@ class TestSeniorDeveloperEdgeCasesCoverage(unittest.TestCase):
         self.assertFalse(result["needs_attention"])
 
     def test_analyzer_analyze_modernization_unexpected_exception(self):
-        mock_repo = MagicMock()
+        mock_repo = MagicMock(spec=Repository)
         mock_repo.default_branch = "main"
         mock_repo.get_git_tree.side_effect = Exception("API Error")
         self.agent.get_repository_info = MagicMock(return_value=mock_repo)
@@ -188,7 +193,7 @@ class TestSeniorDeveloperEdgeCasesCoverage(unittest.TestCase):
 
     def test_analyzer_analyze_performance_unexpected_exception(self):
         from github.GithubException import UnknownObjectException
-        mock_repo = MagicMock()
+        mock_repo = MagicMock(spec=Repository)
         mock_repo.default_branch = "main"
         def mock_get_contents(path):
             raise UnknownObjectException(404, "Not found")
@@ -200,7 +205,7 @@ class TestSeniorDeveloperEdgeCasesCoverage(unittest.TestCase):
 
     def test_analyzer_analyze_cicd_unknown_object(self):
         from github.GithubException import UnknownObjectException
-        mock_repo = MagicMock()
+        mock_repo = MagicMock(spec=Repository)
         def mock_get_contents(path):
             if path == ".github/workflows": return "exists"
             raise UnknownObjectException(404, "Not found")
@@ -211,7 +216,7 @@ class TestSeniorDeveloperEdgeCasesCoverage(unittest.TestCase):
 
     def test_analyzer_analyze_roadmap_unknown_object(self):
         from github.GithubException import UnknownObjectException
-        mock_repo = MagicMock()
+        mock_repo = MagicMock(spec=Repository)
         mock_repo.get_contents.side_effect = UnknownObjectException(404, "Not found")
         self.agent.get_repository_info = MagicMock(return_value=mock_repo)
         result = self.agent.analyzer.analyze_roadmap_features("repo")
@@ -219,7 +224,7 @@ class TestSeniorDeveloperEdgeCasesCoverage(unittest.TestCase):
 
     def test_analyzer_analyze_tech_debt_unknown_object(self):
         from github.GithubException import UnknownObjectException
-        mock_repo = MagicMock()
+        mock_repo = MagicMock(spec=Repository)
         mock_repo.default_branch = "main"
         mock_repo.get_git_tree.side_effect = UnknownObjectException(404, "Not found")
         self.agent.get_repository_info = MagicMock(return_value=mock_repo)
@@ -227,7 +232,7 @@ class TestSeniorDeveloperEdgeCasesCoverage(unittest.TestCase):
         self.assertFalse(result["needs_attention"])
 
     def test_analyzer_analyze_tech_debt_no_branch(self):
-        mock_repo = MagicMock()
+        mock_repo = MagicMock(spec=Repository)
         mock_repo.default_branch = None
         self.agent.get_repository_info = MagicMock(return_value=mock_repo)
         result = self.agent.analyzer.analyze_tech_debt("repo")
@@ -235,7 +240,7 @@ class TestSeniorDeveloperEdgeCasesCoverage(unittest.TestCase):
 
     def test_analyzer_analyze_modernization_unknown_object(self):
         from github.GithubException import UnknownObjectException
-        mock_repo = MagicMock()
+        mock_repo = MagicMock(spec=Repository)
         mock_repo.default_branch = "main"
         mock_repo.get_git_tree.side_effect = UnknownObjectException(404, "Not found")
         self.agent.get_repository_info = MagicMock(return_value=mock_repo)
@@ -243,7 +248,7 @@ class TestSeniorDeveloperEdgeCasesCoverage(unittest.TestCase):
         self.assertFalse(result["needs_modernization"])
 
     def test_analyzer_analyze_modernization_no_branch(self):
-        mock_repo = MagicMock()
+        mock_repo = MagicMock(spec=Repository)
         mock_repo.default_branch = None
         self.agent.get_repository_info = MagicMock(return_value=mock_repo)
         result = self.agent.analyzer.analyze_modernization("repo")
@@ -251,7 +256,7 @@ class TestSeniorDeveloperEdgeCasesCoverage(unittest.TestCase):
 
     def test_analyzer_analyze_performance_unknown_object(self):
         from github.GithubException import UnknownObjectException
-        mock_repo = MagicMock()
+        mock_repo = MagicMock(spec=Repository)
         mock_repo.default_branch = "main"
         mock_repo.get_contents.side_effect = UnknownObjectException(404, "Not found")
         mock_repo.get_git_tree.side_effect = UnknownObjectException(404, "Not found")
@@ -260,12 +265,10 @@ class TestSeniorDeveloperEdgeCasesCoverage(unittest.TestCase):
         self.assertFalse(result["needs_optimization"])
 
     def test_analyzer_analyze_modernization_has_js_ts(self):
-        mock_repo = MagicMock()
+        mock_repo = MagicMock(spec=Repository)
         mock_repo.default_branch = "main"
         mock_tree = MagicMock()
-        item1 = MagicMock(); item1.path = "app.ts"
-        item2 = MagicMock(); item2.path = "legacy.js"
-        mock_tree.tree = [item1, item2]
+        mock_tree.tree = [SimpleNamespace(path="app.ts"), SimpleNamespace(path="legacy.js")]
         mock_repo.get_git_tree.return_value = mock_tree
         mock_content = MagicMock()
         mock_content.decoded_content = b"console.log('hello');"
@@ -276,11 +279,10 @@ class TestSeniorDeveloperEdgeCasesCoverage(unittest.TestCase):
         self.assertIn("Mixed JS/TS codebase - complete TypeScript migration", result["details"])
 
     def test_analyzer_analyze_modernization_common_js_promise(self):
-        mock_repo = MagicMock()
+        mock_repo = MagicMock(spec=Repository)
         mock_repo.default_branch = "main"
         mock_tree = MagicMock()
-        item1 = MagicMock(); item1.path = "app.js"
-        mock_tree.tree = [item1]
+        mock_tree.tree = [SimpleNamespace(path="app.js")]
         mock_repo.get_git_tree.return_value = mock_tree
         mock_content = MagicMock()
         mock_content.decoded_content = b"require('fs');\nfetch().then(console.log);"
@@ -293,7 +295,7 @@ class TestSeniorDeveloperEdgeCasesCoverage(unittest.TestCase):
 
     def test_analyzer_analyze_performance_unknown_object_pkg(self):
         from github.GithubException import UnknownObjectException
-        mock_repo = MagicMock()
+        mock_repo = MagicMock(spec=Repository)
         mock_repo.default_branch = "main"
         def mock_get_contents(path):
             if path == "package.json": raise UnknownObjectException(404, "Not found")
@@ -308,7 +310,7 @@ class TestSeniorDeveloperEdgeCasesCoverage(unittest.TestCase):
 
     def test_analyzer_analyze_cicd_github_exception(self):
         from github.GithubException import GithubException
-        mock_repo = MagicMock()
+        mock_repo = MagicMock(spec=Repository)
         def mock_get_contents(path):
             if path == ".github/workflows": return "exists"
             raise GithubException(500, "Error")
@@ -319,7 +321,7 @@ class TestSeniorDeveloperEdgeCasesCoverage(unittest.TestCase):
 
     def test_analyzer_analyze_tech_debt_github_exception(self):
         from github.GithubException import GithubException
-        mock_repo = MagicMock()
+        mock_repo = MagicMock(spec=Repository)
         mock_repo.default_branch = "main"
         mock_repo.get_git_tree.side_effect = GithubException(500, "Error")
         self.agent.get_repository_info = MagicMock(return_value=mock_repo)
@@ -328,7 +330,7 @@ class TestSeniorDeveloperEdgeCasesCoverage(unittest.TestCase):
 
     def test_analyzer_analyze_performance_github_exception(self):
         from github.GithubException import GithubException
-        mock_repo = MagicMock()
+        mock_repo = MagicMock(spec=Repository)
         mock_repo.default_branch = "main"
         def mock_get_contents(path):
             if path == "package.json": raise GithubException(500, "Error")
@@ -341,7 +343,7 @@ class TestSeniorDeveloperEdgeCasesCoverage(unittest.TestCase):
 
     def test_analyzer_analyze_roadmap_github_exception(self):
         from github.GithubException import GithubException
-        mock_repo = MagicMock()
+        mock_repo = MagicMock(spec=Repository)
         mock_repo.get_contents.side_effect = GithubException(500, "Error")
         self.agent.get_repository_info = MagicMock(return_value=mock_repo)
         result = self.agent.analyzer.analyze_roadmap_features("repo")
@@ -349,7 +351,7 @@ class TestSeniorDeveloperEdgeCasesCoverage(unittest.TestCase):
 
     def test_analyzer_analyze_modernization_github_exception(self):
         from github.GithubException import GithubException
-        mock_repo = MagicMock()
+        mock_repo = MagicMock(spec=Repository)
         mock_repo.default_branch = "main"
         mock_repo.get_git_tree.side_effect = GithubException(500, "Error")
         self.agent.get_repository_info = MagicMock(return_value=mock_repo)
@@ -358,7 +360,7 @@ class TestSeniorDeveloperEdgeCasesCoverage(unittest.TestCase):
 
     def test_analyzer_analyze_performance_tree_github_exception(self):
         from github.GithubException import GithubException
-        mock_repo = MagicMock()
+        mock_repo = MagicMock(spec=Repository)
         mock_repo.default_branch = "main"
         def mock_get_contents(path):
             if path == "package.json": return MagicMock()
@@ -370,7 +372,7 @@ class TestSeniorDeveloperEdgeCasesCoverage(unittest.TestCase):
 
     def test_analyzer_analyze_security_dependabot_github_exception(self):
         from github.GithubException import GithubException
-        mock_repo = MagicMock()
+        mock_repo = MagicMock(spec=Repository)
         def mock_get_contents(path):
             if path == ".gitignore": return MagicMock(decoded_content=b"secrets")
             if path == ".github/dependabot.yml": raise GithubException(500, "Error")
@@ -384,7 +386,7 @@ class TestSeniorDeveloperEdgeCasesCoverage(unittest.TestCase):
 
     def test_analyzer_analyze_cicd_github_exception_tests(self):
         from github.GithubException import GithubException
-        mock_repo = MagicMock()
+        mock_repo = MagicMock(spec=Repository)
         def mock_get_contents(path):
             if path == ".github/workflows": return "exists"
             if path == "": raise GithubException(500, "Error")
@@ -396,7 +398,7 @@ class TestSeniorDeveloperEdgeCasesCoverage(unittest.TestCase):
         self.assertIn("Empty repository or no files found - add project structure and tests", result["improvements"])
 
     def test_analyzer_analyze_tech_debt_no_files(self):
-        mock_repo = MagicMock()
+        mock_repo = MagicMock(spec=Repository)
         mock_repo.default_branch = "main"
         mock_tree = MagicMock()
         mock_tree.tree = []
@@ -406,40 +408,30 @@ class TestSeniorDeveloperEdgeCasesCoverage(unittest.TestCase):
         self.assertFalse(result["needs_attention"])
 
     def test_analyzer_analyze_tech_debt_high_utils(self):
-        mock_repo = MagicMock()
+        mock_repo = MagicMock(spec=Repository)
         mock_repo.default_branch = "main"
         mock_tree = MagicMock()
-        items = []
-        for i in range(6):
-            item = MagicMock()
-            item.path = f"utils_{i}.py"
-            item.size = 100
-            items.append(item)
-        mock_tree.tree = items
+        mock_tree.tree = [SimpleNamespace(path=f"utils_{i}.py", size=100) for i in range(6)]
         mock_repo.get_git_tree.return_value = mock_tree
         self.agent.get_repository_info = MagicMock(return_value=mock_repo)
         result = self.agent.analyzer.analyze_tech_debt("repo")
         self.assertTrue(result["needs_attention"])
 
     def test_analyzer_analyze_modernization_ts_only(self):
-        mock_repo = MagicMock()
+        mock_repo = MagicMock(spec=Repository)
         mock_repo.default_branch = "main"
         mock_tree = MagicMock()
-        item = MagicMock()
-        item.path = "app.ts"
-        mock_tree.tree = [item]
+        mock_tree.tree = [SimpleNamespace(path="app.ts")]
         mock_repo.get_git_tree.return_value = mock_tree
         self.agent.get_repository_info = MagicMock(return_value=mock_repo)
         result = self.agent.analyzer.analyze_modernization("repo")
         self.assertFalse(result["needs_modernization"])
 
     def test_analyzer_analyze_modernization_js_only(self):
-        mock_repo = MagicMock()
+        mock_repo = MagicMock(spec=Repository)
         mock_repo.default_branch = "main"
         mock_tree = MagicMock()
-        item = MagicMock()
-        item.path = "app.js"
-        mock_tree.tree = [item]
+        mock_tree.tree = [SimpleNamespace(path="app.js")]
         mock_repo.get_git_tree.return_value = mock_tree
         mock_content = MagicMock()
         mock_content.decoded_content = b"const x = 1;"
@@ -450,14 +442,14 @@ class TestSeniorDeveloperEdgeCasesCoverage(unittest.TestCase):
         self.assertIn("Legacy JavaScript codebase - consider TypeScript migration", result["details"])
 
     def test_analyzer_analyze_performance_large_codebase(self):
-        mock_repo = MagicMock()
+        mock_repo = MagicMock(spec=Repository)
         mock_repo.default_branch = "main"
         def mock_get_contents(path):
             if path == "package.json": return MagicMock(decoded_content=b"{}")
             return MagicMock()
         mock_repo.get_contents.side_effect = mock_get_contents
         mock_tree = MagicMock()
-        mock_tree.tree = [MagicMock()] * 201
+        mock_tree.tree = _LARGE_TREE
         mock_repo.get_git_tree.return_value = mock_tree
         self.agent.get_repository_info = MagicMock(return_value=mock_repo)
         result = self.agent.analyzer.analyze_performance("repo")
@@ -465,7 +457,7 @@ class TestSeniorDeveloperEdgeCasesCoverage(unittest.TestCase):
         self.assertIn("Large codebase - perform general performance audit", result["details"])
 
     def test_analyzer_analyze_cicd_no_workflows(self):
-        mock_repo = MagicMock()
+        mock_repo = MagicMock(spec=Repository)
         def mock_get_contents(path):
             if path == ".github/workflows": return []
             return [MagicMock(name="test")]
@@ -1,134 +1,99 @@
 import os
-import unittest
 from unittest.mock import patch
 
+import pytest
+
 from src.config.settings import Settings
 
+# Group the module on one xdist worker; every test swaps os.environ wholesale.
+pytestmark = pytest.mark.xdist_group(name="settings")
+
+
+def _from_env(env):
+    """Build Settings from exactly ``env``, with nothing leaking in from the real environment."""
+    with patch.dict(os.environ, env, clear=True):
+        return Settings.from_env()
+
+
+def test_from_env_defaults():
+    settings = _from_env({"GITHUB_TOKEN": "token", "JULES_API_KEY": "key"})
+    assert settings.ai_provider == "ollama"
+    assert settings.ai_model == "qwen3:1.7b"
+    assert settings.ollama_base_url == "http://localhost:11434"
+    assert settings.openai_api_key is None
+
+
+def test_from_env_custom():
+    settings = _from_env({
+        "GITHUB_TOKEN": "token",
+        "JULES_API_KEY": "key",
+        "AI_PROVIDER": "openai",
+        "AI_MODEL": "gpt-5-codex",
+        "OPENAI_API_KEY": "openai-key"
+    })
+    assert settings.ai_provider == "openai"
+    assert settings.ai_model == "gpt-5-codex"
+    assert settings.openai_api_key == "openai-key"
+
+
+@pytest.mark.parametrize("provider, model", [("ollama", "qwen3:1.7b"), ("openai", "gpt-4o")])
+def test_from_env_default_model_by_provider(provider, model):
+    settings = _from_env({"GITHUB_TOKEN": "token", "AI_PROVIDER": provider})
+    assert settings.ai_provider == provider
+    assert settings.ai_model == model
+
+
+def test_missing_required():
+    with pytest.raises(ValueError, match="GITHUB_TOKEN"):
+        _from_env({})
+
+
+def test_missing_jules_key():
+    assert _from_env({"GITHUB_TOKEN": "t"}).jules_api_key is None
+
+
+def test_boolean_parsing_supports_yes_no():
+    settings = _from_env({
+        "GITHUB_TOKEN": "token",
+        "PM_AGENT_ENABLED": "YES",
+        "UI_AGENT_ENABLED": "no",
+        "DEV_AGENT_ENABLED": "1",
+        "PR_ASSISTANT_ENABLED": "off",
+    })
+    assert settings.enable_product_manager
+    assert not settings.enable_interface_developer
+    assert settings.enable_senior_developer
+    assert not settings.enable_pr_assistant
+
+
+def test_invalid_ai_provider_raises():
+    with pytest.raises(ValueError, match="AI_PROVIDER"):
+        _from_env({"GITHUB_TOKEN": "token", "ENABLE_AI": "true", "AI_PROVIDER": "invalid"})
+
+
+def test_invalid_ai_provider_is_ignored_when_ai_disabled():
+    settings = _from_env({"GITHUB_TOKEN": "token", "ENABLE_AI": "false", "AI_PROVIDER": "invalid"})
+    assert settings.ai_provider == "ollama"
+    assert settings.ai_model == "qwen3:1.7b"
+
+
+@pytest.mark.parametrize("interval", ["0", "abc"])
+def test_invalid_agent_interval_raises(interval):
+    with pytest.raises(ValueError, match="AGENT_RUN_INTERVAL_HOURS"):
+        _from_env({"GITHUB_TOKEN": "token", "AGENT_RUN_INTERVAL_HOURS": interval})
+
+
+def test_empty_provider_uses_default():
+    settings = _from_env({"GITHUB_TOKEN": "token", "AI_PROVIDER": "   "})
+    assert settings.ai_provider == "ollama"
+    assert settings.ai_model == "qwen3:1.7b"
+
+
+def test_invalid_bool_returns_default():
+    settings = _from_env({"GITHUB_TOKEN": "token", "PM_AGENT_ENABLED": "invalid"})
+    assert settings.enable_product_manager  # Default is True
+
 
-class TestSettings(unittest.TestCase):
-    def test_from_env_defaults(self):
-        with patch.dict(os.environ, {
-            "GITHUB_TOKEN": "token",
-            "JULES_API_KEY": "key"
-        }, clear=True):
-            settings = Settings.from_env()
-            self.assertEqual(settings.ai_provider, "ollama")
-            self.assertEqual(settings.ai_model, "qwen3:1.7b")
-            self.assertEqual(settings.ollama_base_url, "http://localhost:11434")
-            self.assertIsNone(settings.openai_api_key)
-
-    def test_from_env_custom(self):
-        with patch.dict(os.environ, {
-            "GITHUB_TOKEN": "token",
-            "JULES_API_KEY": "key",
-            "AI_PROVIDER": "openai",
-            "AI_MODEL": "gpt-5-codex",
-            "OPENAI_API_KEY": "openai-key"
-        }, clear=True):
-            settings = Settings.from_env()
-            self.assertEqual(settings.ai_provider, "openai")
-            self.assertEqual(settings.ai_model, "gpt-5-codex")
-            self.assertEqual(settings.openai_api_key, "openai-key")
-
-    def test_from_env_default_model_by_provider(self):
-        # Test default model for ollama
-        with patch.dict(os.environ, {
-            "GITHUB_TOKEN": "token",
-            "AI_PROVIDER": "ollama"
-        }, clear=True):
-            settings = Settings.from_env()
-            self.assertEqual(settings.ai_provider, "ollama")
-            self.assertEqual(settings.ai_model, "qwen3:1.7b")
-
-        # Test default model for openai
-        with patch.dict(os.environ, {
-            "GITHUB_TOKEN": "token",
-            "AI_PROVIDER": "openai"
-        }, clear=True):
-            settings = Settings.from_env()
-            self.assertEqual(settings.ai_provider, "openai")
-            self.assertEqual(settings.ai_model, "gpt-4o")
-
-    def test_missing_required(self):
-        with patch.dict(os.environ, {}, clear=True):
-            with self.assertRaisesRegex(ValueError, "GITHUB_TOKEN"):
-                Settings.from_env()
-
-    def test_missing_jules_key(self):
-        with patch.dict(os.environ, {"GITHUB_TOKEN": "t"}, clear=True):
-            settings = Settings.from_env()
-            self.assertIsNone(settings.jules_api_key)
-
-    def test_boolean_parsing_supports_yes_no(self):
-        with patch.dict(os.environ, {
-            "GITHUB_TOKEN": "token",
-            "PM_AGENT_ENABLED": "YES",
-            "UI_AGENT_ENABLED": "no",
-            "DEV_AGENT_ENABLED": "1",
-            "PR_ASSISTANT_ENABLED": "off",
-        }, clear=True):
-            settings = Settings.from_env()
-            self.assertTrue(settings.enable_product_manager)
-            self.assertFalse(settings.enable_interface_developer)
-            self.assertTrue(settings.enable_senior_developer)
-            self.assertFalse(settings.enable_pr_assistant)
-
-    def test_invalid_ai_provider_raises(self):
-        with patch.dict(os.environ, {
-            "GITHUB_TOKEN": "token",
-            "ENABLE_AI": "true",
-            "AI_PROVIDER": "invalid"
-        }, clear=True):
-            with self.assertRaisesRegex(ValueError, "AI_PROVIDER"):
-                Settings.from_env()
-
-    def test_invalid_ai_provider_is_ignored_when_ai_disabled(self):
-        with patch.dict(os.environ, {
-            "GITHUB_TOKEN": "token",
-            "ENABLE_AI": "false",
-            "AI_PROVIDER": "invalid"
-        }, clear=True):
-            settings = Settings.from_env()
-            self.assertEqual(settings.ai_provider, "ollama")
-            self.assertEqual(settings.ai_model, "qwen3:1.7b")
-
-    def test_invalid_agent_interval_raises(self):
-        with patch.dict(os.environ, {
-            "GITHUB_TOKEN": "token",
-            "AGENT_RUN_INTERVAL_HOURS": "0"
-        }, clear=True):
-            with self.assertRaisesRegex(ValueError, "AGENT_RUN_INTERVAL_HOURS"):
-                Settings.from_env()
-
-    def test_non_numeric_agent_interval_raises(self):
-        with patch.dict(os.environ, {
-            "GITHUB_TOKEN": "token",
-            "AGENT_RUN_INTERVAL_HOURS": "abc"
-        }, clear=True):
-            with self.assertRaisesRegex(ValueError, "AGENT_RUN_INTERVAL_HOURS"):
-                Settings.from_env()
-
-    def test_empty_provider_uses_default(self):
-        with patch.dict(os.environ, {
-            "GITHUB_TOKEN": "token",
-            "AI_PROVIDER": "   "
-        }, clear=True):
-            settings = Settings.from_env()
-            self.assertEqual(settings.ai_provider, "ollama")
-            self.assertEqual(settings.ai_model, "qwen3:1.7b")
-
-    def test_invalid_bool_returns_default(self):
-        with patch.dict(os.environ, {
-            "GITHUB_TOKEN": "token",
-            "PM_AGENT_ENABLED": "invalid"
-        }, clear=True):
-            settings = Settings.from_env()
-            self.assertTrue(settings.enable_product_manager)  # Default is True
-
-    def test_positive_int_parsing(self):
-        with patch.dict(os.environ, {
-            "GITHUB_TOKEN": "token",
-            "AGENT_RUN_INTERVAL_HOURS": "12"
-        }, clear=True):
-            settings = Settings.from_env()
-            self.assertEqual(settings.agent_run_interval_hours, 12)
+def test_positive_int_parsing():
+    settings = _from_env({"GITHUB_TOKEN": "token", "AGENT_RUN_INTERVAL_HOURS": "12"})
+    assert settings.agent_run_interval_hours == 12
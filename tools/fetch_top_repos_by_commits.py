@@ -7,89 +7,276 @@ Usage:
   python tools/fetch_top_repos_by_commits.py --user USERNAME --top 30 --out config/repositories.json --replace
 
 Notes:
-- Uses GITHUB_TOKEN env var if available to increase rate limits.
-- Commit count is approximated by summing the `contributions` field from the
-  Contributors API for each repo (includes anonymous contributors).
+- With GITHUB_TOKEN set, commit counts come from the GraphQL API: the exact
+  default-branch history length, 100 repos per request.
+- Without a token (or with --rest), commit count is approximated by summing the
+  `contributions` field from the Contributors API for each repo (includes
+  anonymous contributors), one paginated REST call chain per repo.
+- Responses are cached with their ETag in .cache/github_api.sqlite3; re-runs send
+  If-None-Match and reuse the cached body on 304, which GitHub does not count
+  against the rate limit. Pass --no-cache to bypass it.
+- Requests run at up to --rate per second until X-RateLimit-Remaining drops
+  below 10% of the limit; the rest of the budget is then spread until reset.
 """
 import argparse
 import json
 import os
+import re
+import sqlite3
 import sys
+import tempfile
+import threading
 import time
-from urllib.parse import urlparse, parse_qs
-from urllib.request import Request, urlopen
+from concurrent.futures import ThreadPoolExecutor
 
+import requests
+from requests.adapters import HTTPAdapter
 
-def request_json(url, token=None):
-    req = Request(url, headers={"User-Agent": "github-assistant-script"})
+DEFAULT_CACHE_FILE = os.path.join(".cache", "github_api.sqlite3")
+GRAPHQL_URL = "https://api.github.com/graphql"
+REQUEST_TIMEOUT = 30
+# Link header entry format: <https://...>; rel="next"
+NEXT_LINK_RE = re.compile(r'<([^>]+)>;\s*rel="next"')
+COMMIT_COUNTS_QUERY = """
+query($login: String!, $cursor: String) {
+  repositoryOwner(login: $login) {
+    repositories(first: 100, after: $cursor, ownerAffiliations: OWNER) {
+      pageInfo { endCursor hasNextPage }
+      nodes {
+        nameWithOwner
+        defaultBranchRef { target { ... on Commit { history { totalCount } } } }
+      }
+    }
+  }
+}
+"""
+
+
+class RateLimiter:
+    """Space requests at least ``1 / rate`` seconds apart, across all worker threads."""
+
+    def __init__(self, rate):
+        self._interval = 1.0 / rate
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self._interval
+        if delay > 0:
+            time.sleep(delay)
+
+    def observe(self, headers):
+        """Back off when GitHub reports under 10% of the budget left: spread the rest until reset."""
+        try:
+            remaining = int(headers["X-RateLimit-Remaining"])
+            limit = int(headers["X-RateLimit-Limit"])
+            reset = float(headers["X-RateLimit-Reset"])
+        except (KeyError, TypeError, ValueError):
+            return
+        if remaining > limit * 0.1:
+            return
+        delay = max(0.0, reset - time.time()) / max(1, remaining)
+        with self._lock:
+            self._next = max(self._next, time.monotonic() + delay)
+
+
+class ResponseCache:
+    """On-disk store of GitHub API responses keyed by URL, revalidated by ETag."""
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # Shared by the worker threads; the lock serialises access to the one connection.
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(url TEXT PRIMARY KEY, etag TEXT NOT NULL, body BLOB NOT NULL, headers TEXT NOT NULL)"
+        )
+
+    def get(self, url):
+        """Return ``(etag, body, headers)`` for *url*, or None if it was never cached."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT etag, body, headers FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        etag, body, headers = row
+        return etag, body, json.loads(headers)
+
+    def put(self, url, etag, body, headers):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                (url, etag, body, json.dumps(headers)),
+            )
+            self._db.commit()
+
+    def close(self):
+        self._db.close()
+
+
+def positive_float(value):
+    """argparse type for options that must be a number above zero."""
+    number = float(value)
+    if not number > 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {value}")
+    return number
+
+
+def make_session(token=None, pool_size=16):
+    """Return a keep-alive session for api.github.com whose pool fits *pool_size* worker threads."""
+    session = requests.Session()
+    session.headers["User-Agent"] = "github-assistant-script"
     if token:
-        req.add_header("Authorization", f"token {token}")
-    with urlopen(req) as resp:
-        body = resp.read().decode("utf-8")
-        headers = dict(resp.getheaders())
-    return json.loads(body), headers
+        session.headers["Authorization"] = f"token {token}"
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, pool_size))
+    session.mount("https://", adapter)
+    return session
+
 
+def request_json(session, url, cache=None, limiter=None):
+    """GET *url* and return ``(data, headers, from_cache)``."""
+    cached = cache.get(url) if cache else None
+    extra = {"If-None-Match": cached[0]} if cached else None
+    if limiter:
+        limiter.wait()
+    resp = session.get(url, headers=extra, timeout=REQUEST_TIMEOUT)
+    if limiter:
+        limiter.observe(resp.headers)
+    if resp.status_code == 304 and cached:
+        _, body, headers = cached
+        return json.loads(body), headers, True
+    resp.raise_for_status()
+    # json.loads takes the raw UTF-8 bytes; skip the intermediate str copy.
+    body = resp.content
+    headers = resp.headers
+    if cache and headers.get("ETag"):
+        cache.put(url, headers["ETag"], body, {"Link": headers.get("Link")})
+    return json.loads(body), headers, False
 
-def get_all_contributors_contributions(contribs_url, token=None):
+
+def get_all_contributors_contributions(session, contribs_url, cache=None, limiter=None):
     # contributors_url usually ends with /contributors; use per_page=100 and follow pagination
     url = contribs_url + "?per_page=100&anon=1"
     total = 0
     while url:
-        arr, headers = request_json(url, token)
+        arr, headers, _ = request_json(session, url, cache, limiter)
         if not isinstance(arr, list):
             break
         for c in arr:
             total += c.get("contributions", 0)
-        link = headers.get("Link")
-        next_url = None
-        if link:
-            # parse Link header to find rel="next"
-            parts = [p.strip() for p in link.split(",")]
-            for p in parts:
-                if 'rel="next"' in p:
-                    # format: <https://...>; rel="next"
-                    start = p.find("<") + 1
-                    end = p.find(">", start)
-                    next_url = p[start:end]
-                    break
-        url = next_url
-        if url:
-            time.sleep(0.1)
+        match = NEXT_LINK_RE.search(headers.get("Link") or "")
+        url = match.group(1) if match else None
     return total
 
 
-def main():
-    p = argparse.ArgumentParser()
-    p.add_argument("--user", "-u", required=True)
-    p.add_argument("--top", "-n", type=int, default=30)
-    p.add_argument("--out", default="config/repositories.json")
-    p.add_argument("--replace", action="store_true", help="Replace repositories array")
-    args = p.parse_args()
+def fetch_commit_counts_graphql(session, user, limiter=None):
+    """Return ``[{"full_name", "commits"}]`` for every repo *user* owns, 100 per request.
+
+    *user* may be a user or an organization login; both resolve as a repositoryOwner.
+    """
+    results = []
+    cursor = None
+    while True:
+        payload = {"query": COMMIT_COUNTS_QUERY, "variables": {"login": user, "cursor": cursor}}
+        if limiter:
+            limiter.wait()
+        resp = session.post(GRAPHQL_URL, json=payload, timeout=REQUEST_TIMEOUT)
+        if limiter:
+            limiter.observe(resp.headers)
+        resp.raise_for_status()
+        data = json.loads(resp.content)
+        if data.get("errors"):
+            raise RuntimeError(data["errors"][0].get("message", "GraphQL error"))
+        owner = data["data"]["repositoryOwner"]
+        if owner is None:
+            raise RuntimeError(f"No GitHub user or organization named {user!r}")
+        repos = owner["repositories"]
+        for node in repos["nodes"]:
+            # Empty repos have no default branch ref.
+            target = (node.get("defaultBranchRef") or {}).get("target") or {}
+            commits = target.get("history", {}).get("totalCount", 0)
+            results.append({"full_name": node["nameWithOwner"], "commits": commits})
+        if not repos["pageInfo"]["hasNextPage"]:
+            return results
+        cursor = repos["pageInfo"]["endCursor"]
 
-    token = os.environ.get("GITHUB_TOKEN")
 
-    repos_url = f"https://api.github.com/users/{args.user}/repos?per_page=100"
-    print(f"Fetching repos list for {args.user}...")
-    repos, _ = request_json(repos_url, token)
+def fetch_commit_counts_rest(session, user, cache, limiter, workers):
+    """Approximate commit counts from each repo's contributors, fetched concurrently."""
+    repos_url = f"https://api.github.com/users/{user}/repos?per_page=100"
+    print(f"Fetching repos list for {user}...")
+    repos, _, _ = request_json(session, repos_url, cache, limiter)
     if not isinstance(repos, list):
         print("Unexpected response for repo list", file=sys.stderr)
         sys.exit(1)
 
-    results = []
-    total_repos = len(repos)
-    for i, r in enumerate(repos, start=1):
-        name = r.get("name")
+    def count_commits(r):
         full_name = r.get("full_name")
-        contribs_url = r.get("contributors_url")
-        print(f"[{i}/{total_repos}] {full_name}: fetching contributors...")
         try:
-            commits = get_all_contributors_contributions(contribs_url, token)
+            commits = get_all_contributors_contributions(session, r.get("contributors_url"), cache, limiter)
         except Exception as e:
             print(f"  failed to fetch contributors for {full_name}: {e}")
             commits = 0
-        results.append({"full_name": full_name, "commits": commits})
-        # be gentle with rate limits
-        time.sleep(0.12)
+        print(f"  {full_name}: {commits} commits")
+        return {"full_name": full_name, "commits": commits}
+
+    # Network-bound: overlap the per-repo fetches; the shared limiter keeps the request rate gentle.
+    print(f"Fetching contributors for {len(repos)} repos with {workers} workers...")
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        return list(pool.map(count_commits, repos))
+
+
+def write_json_atomic(path, data):
+    """Write *data* to *path* via a sibling temp file, so an interrupted run never leaves torn JSON."""
+    # Encode in one pass and write once; json.dump would issue a write per token.
+    text = json.dumps(data, indent=2, ensure_ascii=False)
+    # NamedTemporaryFile owns its descriptor, so nothing leaks if opening the stream fails.
+    tmp = tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=os.path.dirname(path) or ".", suffix=".tmp", delete=False
+    )
+    try:
+        with tmp:
+            tmp.write(text)
+        # The temp file is created 0600; keep the permissions of the file being replaced.
+        os.chmod(tmp.name, os.stat(path).st_mode & 0o777 if os.path.exists(path) else 0o644)
+        os.replace(tmp.name, path)
+    except BaseException:
+        os.unlink(tmp.name)
+        raise
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--user", "-u", required=True)
+    p.add_argument("--top", "-n", type=int, default=30)
+    p.add_argument("--out", default="config/repositories.json")
+    p.add_argument("--replace", action="store_true", help="Replace repositories array")
+    p.add_argument("--cache-file", default=DEFAULT_CACHE_FILE, help="SQLite file for cached API responses")
+    p.add_argument("--no-cache", action="store_true", help="Always fetch fresh API responses")
+    p.add_argument("--workers", type=int, default=16, help="Repositories fetched concurrently")
+    p.add_argument("--rate", type=positive_float, default=30.0, help="Maximum API requests per second")
+    p.add_argument("--rest", action="store_true", help="Use the contributors REST API even with a token")
+    args = p.parse_args()
+
+    token = os.environ.get("GITHUB_TOKEN")
+    cache = None if args.no_cache else ResponseCache(args.cache_file)
+    limiter = RateLimiter(args.rate)
+    # One session for the whole run: every request reuses a pooled keep-alive connection.
+    session = make_session(token, pool_size=args.workers)
+
+    if token and not args.rest:
+        print(f"Fetching commit counts for {args.user} via GraphQL...")
+        results = fetch_commit_counts_graphql(session, args.user, limiter)
+    else:
+        results = fetch_commit_counts_rest(session, args.user, cache, limiter, args.workers)
+    session.close()
+    if cache:
+        cache.close()
 
     # sort and pick top N
     results.sort(key=lambda x: x["commits"], reverse=True)
@@ -112,20 +299,14 @@ def main():
     if args.replace or "repositories" not in cfg:
         cfg["repositories"] = new_repos
     else:
-        # append unique ones preserving existing order first
-        existing = cfg.get("repositories", [])
-        merged = existing[:]
-        for r in new_repos:
-            if r not in merged:
-                merged.append(r)
-        cfg["repositories"] = merged
+        # append unique ones preserving existing order first (dict keys keep insertion order)
+        cfg["repositories"] = list(dict.fromkeys(cfg.get("repositories", []) + new_repos))
 
     # ensure description remains if present
     if "description" not in cfg:
         cfg["description"] = "List of repositories that agents are allowed to work on. Add repositories in 'owner/repo' format."
 
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(cfg, f, indent=2, ensure_ascii=False)
+    write_json_atomic(out_path, cfg)
 
     print(f"\nUpdated {out_path} with top {len(new_repos)} repositories.")
 